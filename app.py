@@ -1,30 +1,99 @@
 from modules.agent import ChatbotAgent
 from modules.db import UserData
-from fastapi import FastAPI, Request, BackgroundTasks
-from fastapi.responses import JSONResponse
-from utils.util import GREEN, RED, RESET
+from modules.registry import AgentRegistry
+from modules.delivery import CallbackDispatcher
+from modules.inbox import UserInbox, InboxMessage
+from modules.store import SqliteLeaseLock
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from contextlib import asynccontextmanager
+from utils.logger import logger, log_context, setup_logging
+from utils.cache import cache_stats
+from utils.metrics import render_metrics, TURN_SECONDS
+from configs.config import system_config
+from importlib.resources import files
 import uvicorn
-import httpx
-import requests
 import time
+import uuid
+import os
 
-app = FastAPI()
-user_agents = {}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Des:
+        서버 시작/종료시 실행되는 함수
+            - 시작시 로그 설정(파일/터미널), LLM 클라이언트/DB/그래프 준비 (startup.warmup) 및 콜백 전송 대기열 시작 (공용 HTTP 클라이언트, 동시 전송 수 제한, 재시도)
+            - 종료시 처리중인 요청/사용자 정보 갱신을 마치고 남은 콜백 전송, 아직 DB에 반영되지 않은 사용자 정보 저장
+    """
+    setup_logging()
+    if system_config.startup.warmup:
+        await ChatbotAgent.warmup()
+    app.state.dispatcher = CallbackDispatcher(
+        concurrency=system_config.callback.concurrency,
+        queue_size=system_config.callback.queue_size,
+        max_connections=system_config.callback.max_connections,
+        timeout=system_config.callback.timeout,
+        backoff_base=system_config.callback.backoff_base,
+        backoff_max=system_config.callback.backoff_max,
+    )
+    await app.state.dispatcher.start()
+    yield
+    await inbox.join()
+    await ChatbotAgent.drain_background()
+    await app.state.dispatcher.stop()
+    ChatbotAgent.shutdown()
 
 
-async def get_answer(agent: ChatbotAgent, question: str, kakao_callback_url: str):
+app = FastAPI(lifespan=lifespan)
+user_agents = AgentRegistry(
+    max_agents=system_config.registry.max_agents,
+    idle_ttl=system_config.registry.idle_ttl,
+    base_agent_bytes=system_config.registry.base_agent_bytes,
+    # 실행중인 사용자의 에이전트는 제거하지 않음 (inbox 는 아래에서 생성)
+    is_busy=lambda user_id: inbox.is_busy(user_id),
+)
+MERGED_MESSAGE_NOTICE = "이어서 보내주신 메시지와 함께 답변드릴게요 😊"
+
+
+def is_command(question: str) -> bool:
     """
     Des:
-        GPT 응답 생성 및 Webhook 호출
+        다른 메시지와 합치지 않고 단독으로 처리할 명령어인지 확인하는 함수
+    """
+    return (
+        "새로운 대화 시작할래요!" in question
+        or "사용법" == question
+        or "사용법 안내" in question
+    )
+
+
+async def get_answer(agent: ChatbotAgent, messages: list[InboxMessage]):
+    """
+    Des:
+        GPT 응답 생성 및 카카오 콜백 호출
+            - 답변 생성 중에 이어서 보낸 메시지들은 하나로 합쳐서 한번만 답변
+            - 합쳐진 메시지 중 마지막 콜백으로 답변을 보내고, 나머지 콜백에는 안내 문구 전달
+            - 이 요청에서 남기는 로그에는 사용자/요청 ID 가 붙음
     Args:
         agent: ChatbotAgent 인스턴스
-        question: 사용자 질문
-        kakao_callback_url: 카카오 콜백 URL
+        messages: 사용자 메시지 리스트 (명령어는 항상 1건)
     """
+    with log_context(
+        user_id=agent.config["configurable"]["user_id"], request_id=uuid.uuid4().hex[:12]
+    ):
+        await _get_answer(agent, messages)
+
+
+async def _get_answer(agent: ChatbotAgent, messages: list[InboxMessage]):
     START_TIME = time.time()
+    if system_config.deployment.mode == "multi":
+        await agent.refresh_config()
+    question = "\n".join(message.question for message in messages)
     if "새로운 대화 시작할래요!" in question:
-        agent._build_graph()
+        await agent.reset_conversation()
         response = "안녕하세요🤗 무엇을 도와드릴까요?"
+        TURN_SECONDS.observe(time.time() - START_TIME, kind="reset")
     elif ("사용법" == question) or ("사용법 안내" in question):
         response = """사용법에 대해 간략히 알려드릴게요!
 
@@ -36,64 +105,125 @@ async def get_answer(agent: ChatbotAgent, question: str, kakao_callback_url: str
 
 그럼 이제 무엇을 도와드릴까요? 🤗"""
     else:
+        for message in messages[:-1]:
+            deliver(message, MERGED_MESSAGE_NOTICE)
         response = await agent.get_response(question=question)
         END_TIME = time.time()
-        print(f"{GREEN}[app.py] Response length : {len(response)}{RESET}")
-        print(f"{GREEN}[app.py] Generation Time : {END_TIME - START_TIME}{RESET}")
-    await send_to_webhook(
-        webhook_url="https://changwoo.ngrok.dev/webhook",
-        response_data={"response": response, "kakao_callback_url": kakao_callback_url},
+        TURN_SECONDS.observe(END_TIME - START_TIME, kind="answer")
+        logger.info(
+            "답변 생성 완료 ({seconds:.2f}s, {length}자, 합친 메시지 {merged}건)",
+            seconds=END_TIME - START_TIME,
+            length=len(response),
+            merged=len(messages),
+        )
+    deliver(messages[-1], response)
+
+
+def deliver(message: InboxMessage, response: str):
+    """
+    Des:
+        callback.mode 에 맞게 답변을 전송 대기열에 넣는 함수
+    Args:
+        message: 답변할 사용자 메시지 (콜백 URL, 수신 시각)
+        response: 전달할 답변
+    """
+    deadline = message.received_at + system_config.callback.window
+    if system_config.callback.mode == "webhook":
+        send_to_webhook(
+            webhook_url=system_config.callback.webhook_url,
+            response_data={"response": response, "kakao_callback_url": message.callback_url},
+            deadline=deadline,
+        )
+    else:
+        send_to_kakao(
+            kakao_callback_url=message.callback_url, response=response, deadline=deadline
+        )
+
+
+def send_to_kakao(kakao_callback_url: str, response: str, deadline: float):
+    """
+    Des:
+        카카오 콜백 호출 함수
+            - AI 답변 생성완료 후 전송 대기열에 넣으면 카카오 callbackUrl 로 전달 (실패시 deadline 까지 재시도)
+    Args:
+        kakao_callback_url: 카카오 콜백 URL
+        response: AI 답변
+        deadline: 재시도를 멈추는 시각
+    """
+    app.state.dispatcher.submit(
+        kakao_callback_url, _kakao_template(response), deadline=deadline
     )
 
 
-async def send_to_webhook(webhook_url: str, response_data: dict):
+def send_to_webhook(webhook_url: str, response_data: dict, deadline: float):
     """
     Des:
-        Webhook 호출 함수
-            - AI 답변 생성완료 후 호출
+        Webhook 호출 함수 (callback.mode == "webhook" 일 때만 사용)
+            - AI 답변 생성완료 후 전송 대기열에 넣으면 Webhook 으로 전달 (실패시 deadline 까지 재시도)
     Args:
         webhook_url: Webhook URL
         response_data: Webhook 호출 시 전달할 데이터
+        deadline: 재시도를 멈추는 시각
+    """
+    app.state.dispatcher.submit(webhook_url, response_data, deadline=deadline)
+
+
+def _kakao_template(response: str) -> dict:
+    """
+    Des:
+        카카오 콜백 응답 형식 생성 함수
     """
-    try:
-        async with httpx.AsyncClient() as client:
-            await client.post(webhook_url, json=response_data)
-    except Exception as e:
-        print(f"{RED}Webhook 호출 중 에러 발생: {e}{RESET}")
+    return {
+        "version": "2.0",
+        "template": {"outputs": [{"simpleText": {"text": response}}]},
+    }
+
+
+# 워커가 여러개면 같은 사용자 요청이 다른 워커에서 동시에 처리되지 않도록 공용 DB 잠금 사용
+user_lock = (
+    SqliteLeaseLock(
+        db_path=os.path.join(files("data"), "sessions.db"),
+        ttl=system_config.deployment.lock_ttl,
+        poll_interval=system_config.deployment.lock_poll_interval,
+    )
+    if system_config.deployment.mode == "multi"
+    else None
+)
+inbox = UserInbox(
+    process=get_answer,
+    is_command=is_command,
+    max_merge=system_config.inbox.max_merge,
+    lock=user_lock.hold if user_lock else None,
+)
 
 
 @app.post("/webhook")
 async def webhook_handler(request: Request):
     """
     Des:
-        카카오 서버로 콜백
+        카카오 서버로 콜백 (callback.mode == "webhook" 호환용)
     Args:
         request: Webhook 호출 시 전달된 데이터
             - response: AI 답변
             - kakao_callback_url: 카카오 콜백 URL
     """
     request_data = await request.json()
-    call_back = requests.post(
-        request_data["kakao_callback_url"],
-        json={
-            "version": "2.0",
-            "template": {
-                "outputs": [{"simpleText": {"text": request_data["response"]}}]
-            },
-        },
+    send_to_kakao(
+        kakao_callback_url=request_data["kakao_callback_url"],
+        response=request_data["response"],
+        deadline=time.time() + system_config.callback.window,
     )
-    # print(f"{GREEN}[app.py] call_back: {call_back.status_code}, {call_back.json()}{RESET}")
     return "OK"
 
 
 @app.post("/question")
-async def handle_question(request: Request, background_tasks: BackgroundTasks):
+async def handle_question(request: Request):
     """
     Des:
         실제 사용자 요청 처리 함수
+            - 사용자별 inbox 에 넣고 바로 응답 (사용자당 한번에 하나씩 처리, 처리 중 들어온 메시지는 합쳐서 처리)
     Args:
         request: 사용자 요청
-        background_tasks: 백그라운드 작업 태스크
     Returns:
         JSONResponse: 카카오 서버에 응답 반환
             - version: 2.0 필수
@@ -103,25 +233,81 @@ async def handle_question(request: Request, background_tasks: BackgroundTasks):
     user_request = request_data.get("userRequest")
     user_id = user_request.get("user").get("id")
 
-    # 사용자별로 개별적으로 에이전트 할당
-    if user_id not in user_agents:
-        user_agents[user_id] = ChatbotAgent()
-        print(
-            f"{GREEN}[app.py] 새로운 사용자 에이전트를 생성했습니다. 사용자 id : {user_id}{RESET}"
-        )
-
-    agent = user_agents[user_id]
-    agent.set_config(user_id=user_id)
-    background_tasks.add_task(
-        get_answer,
-        agent=agent,
-        question=user_request.get("utterance").strip(),
-        kakao_callback_url=user_request.get("callbackUrl"),
+    # 사용자별로 개별적으로 에이전트 할당 (오래 사용하지 않은 에이전트는 자동 제거)
+    agent = user_agents.get(user_id)
+    inbox.submit(
+        user_id,
+        agent,
+        InboxMessage(
+            question=user_request.get("utterance").strip(),
+            callback_url=user_request.get("callbackUrl"),
+            received_at=time.time(),
+        ),
     )
 
     # print(f"{GREEN}[app.py] useCallback:True 를 먼저 리턴합니다. {RESET}")
     return JSONResponse({"version": "2.0", "useCallback": True})
 
 
+@app.get("/metrics")
+async def handle_metrics():
+    """
+    Des:
+        노드/검색 단계/LLM 호출별 소요시간, 토큰, 예상 비용 (Prometheus 형식)
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/stats/cache")
+async def handle_cache_stats():
+    """
+    Des:
+        검색 결과/페이지 내용 캐시 적중률 조회
+    """
+    return JSONResponse({"caches": cache_stats()})
+
+
+@app.get("/stats/agents")
+async def handle_agent_stats():
+    """
+    Des:
+        보관중인 사용자 에이전트 수/추정 메모리 사용량 조회
+    """
+    return JSONResponse(user_agents.stats())
+
+
+@app.get("/stats/llm")
+async def handle_llm_stats():
+    """
+    Des:
+        LLM 호출 수/재시도/429 횟수/대기중인 호출 수 조회
+    """
+    return JSONResponse(ChatbotAgent.llm_stats())
+
+
+@app.get("/stats/inbox")
+async def handle_inbox_stats():
+    """
+    Des:
+        사용자별 요청 대기열 (처리중인 사용자 수, 합쳐진 메시지 수) 조회
+    """
+    return JSONResponse(inbox.stats())
+
+
+@app.get("/stats/callback")
+async def handle_callback_stats():
+    """
+    Des:
+        콜백 전송 지연시간/재시도/포기 건수 조회
+    """
+    return JSONResponse(app.state.dispatcher.stats())
+
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=7860)
+    if system_config.deployment.mode == "multi":
+        # 워커 프로세스마다 app 을 새로 import (세션 상태는 data/sessions.db, data/checkpoints.db 로 공유)
+        uvicorn.run(
+            "app:app", host="0.0.0.0", port=7860, workers=system_config.deployment.workers
+        )
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=7860)
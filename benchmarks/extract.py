@@ -0,0 +1,246 @@
+"""
+Des:
+    페이지 본문 추출 비교 (이전 방식 : bs4 + Html2TextTransformer / 현재 : utils.extract)
+        - 저장해 둔 HTML 페이지(corpus)를 같은 순서로 두 방식에 넣고 페이지당 시간, 출력 길이 비교
+        - <이름>.gold.txt (사람이 정한 본문) 가 있으면 본문 재현율(recall), 출력 중 본문 비율(precision) 도 계산
+            - 단어 단위로 비교하므로 마크다운 기호/줄바꿈 차이는 무시됨
+        - corpus 의 하위 디렉토리가 페이지 그룹 (docs, ko-news, ko-blog, synthetic ...), 재현율은 그룹별로 따로 보고
+            - synthetic (직접 만든 페이지) 은 추출기 규칙에 맞춰 만든 것이므로 실제 페이지 재현율로 보지 않음
+        - corpus 디렉토리가 비어 있으면 부하 테스트용 고정 페이지(fakes.fixture_page) 사용
+
+    실행 (프로젝트 루트에서):
+        python -m benchmarks.extract --save https://n.news.naver.com/... --group ko-news
+        python -m benchmarks.extract --corpus benchmarks/corpus --repeat 5 --json extract.json
+"""
+import re
+import sys
+import json
+import time
+import argparse
+import statistics
+from pathlib import Path
+from collections import Counter
+from urllib.parse import urlsplit
+from benchmarks.load_test import percentile
+
+DEFAULT_CORPUS = Path(__file__).parent / "corpus"
+WORD = re.compile(r"\w+")
+# 실제 한국어 페이지 그룹 (봇이 주로 검색하는 페이지)
+KOREAN_GROUPS = ["ko-news", "ko-blog"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="페이지 본문 추출 비교")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="*.html 페이지 디렉토리")
+    parser.add_argument("--save", nargs="+", metavar="URL", help="페이지를 받아서 corpus 에 저장한 뒤 종료")
+    parser.add_argument("--group", default="ko-news", help="--save 로 저장할 그룹 (corpus 하위 디렉토리)")
+    parser.add_argument("--repeat", type=int, default=3, help="페이지별 반복 횟수 (최소 시간 사용)")
+    parser.add_argument("--fixtures", type=int, default=20, help="corpus 가 비어 있을 때 사용할 고정 페이지 수")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    return parser.parse_args()
+
+
+def save_pages(corpus: Path, urls: list[str]):
+    import httpx
+    from utils.fetcher import HEADERS
+
+    corpus.mkdir(parents=True, exist_ok=True)  # corpus / 그룹
+    with httpx.Client(headers=HEADERS, follow_redirects=True, timeout=10) as client:
+        for url in urls:
+            response = client.get(url)
+            response.raise_for_status()
+            parts = urlsplit(url)
+            name = f"{parts.netloc}{parts.path}".strip("/").replace("/", "_") or parts.netloc
+            path = corpus / f"{name[:100]}.html"
+            path.write_bytes(response.content)
+            print(f"저장 : {path} ({len(response.content):,} bytes)")
+
+
+def load_pages(corpus: Path, fixtures: int) -> list[tuple[str, str, str, str]]:
+    """
+    Returns:
+        list: (그룹, 이름, html, gold 또는 None), 그룹은 corpus 기준 하위 디렉토리 (바로 아래면 "-")
+    """
+    pages = []
+    for path in sorted(corpus.rglob("*.html")):
+        gold = path.with_name(f"{path.stem}.gold.txt")
+        group = path.parent.relative_to(corpus).as_posix()
+        pages.append(
+            (
+                "-" if group == "." else group,
+                path.name,
+                path.read_bytes().decode("utf-8", errors="replace"),
+                gold.read_text(encoding="utf-8") if gold.exists() else None,
+            )
+        )
+    if pages:
+        return pages
+    from benchmarks.fakes import fixture_page
+
+    print(f"[extract] {corpus} 에 페이지가 없어 고정 페이지 {fixtures}개를 사용합니다.")
+    return [("fixture", f"fixture-{i}", fixture_page(i).decode(), None) for i in range(fixtures)]
+
+
+def overlap(text: str, gold: str) -> tuple[float, float]:
+    """
+    Des:
+        (recall, precision) : 본문 단어 중 출력에 있는 비율, 출력 단어 중 본문에 있는 비율
+    """
+    output, expected = Counter(WORD.findall(text.lower())), Counter(WORD.findall(gold.lower()))
+    common = sum((output & expected).values())
+    return (
+        common / max(sum(expected.values()), 1),
+        common / max(sum(output.values()), 1),
+    )
+
+
+def html2text_extract():
+    from bs4 import BeautifulSoup
+    from langchain_core.documents import Document
+    from langchain_community.document_transformers import Html2TextTransformer
+
+    transformer = Html2TextTransformer()
+
+    def extract(html: str) -> tuple[str, str]:
+        soup = BeautifulSoup(html, "html.parser")
+        description = soup.find("meta", attrs={"name": "description"})
+        desc = description.get("content", "") if description else ""
+        docs = transformer.transform_documents([Document(page_content=html)])
+        return desc, docs[0].page_content
+
+    return extract
+
+
+def bounded_extract():
+    from configs.config import system_config
+    from utils.extract import extract_main_content
+
+    def extract(html: str) -> tuple[str, str]:
+        return extract_main_content(
+            html,
+            max_chars=system_config.fetcher.max_bytes,
+            max_text_chars=system_config.fetcher.max_text_chars,
+        )
+
+    return extract
+
+
+def measure(extract, pages: list[tuple[str, str, str, str]], repeat: int) -> list[dict]:
+    results = []
+    for group, name, html, gold in pages:
+        elapsed = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            _, text = extract(html)
+            elapsed.append(time.perf_counter() - start)
+        result = {
+            "group": group,
+            "page": name,
+            "html_chars": len(html),
+            "ms": min(elapsed) * 1000,
+            "text_chars": len(text),
+        }
+        if gold is not None:
+            result["recall"], result["precision"] = overlap(text, gold)
+        results.append(result)
+    return results
+
+
+def summary(results: list[dict]) -> dict:
+    ms = [r["ms"] for r in results]
+    chars = [r["text_chars"] for r in results]
+    scored = [r for r in results if "recall" in r]
+    return {
+        "ms_mean": statistics.mean(ms),
+        "ms_p95": percentile(ms, 95),
+        "text_chars_mean": statistics.mean(chars),
+        "text_chars_total": sum(chars),
+        "recall_mean": statistics.mean(r["recall"] for r in scored) if scored else None,
+        "recall_min": min(r["recall"] for r in scored) if scored else None,
+        "precision_mean": statistics.mean(r["precision"] for r in scored) if scored else None,
+    }
+
+
+def recall_by_group(results: list[dict]) -> dict:
+    """
+    Des:
+        그룹별 본문 재현율/출력 중 본문 비율 (gold 가 있는 페이지만)
+    """
+    groups = {}
+    for result in results:
+        if "recall" in result:
+            groups.setdefault(result["group"], []).append(result)
+    return {
+        group: {
+            "pages": len(scored),
+            "recall_mean": statistics.mean(r["recall"] for r in scored),
+            "recall_min": min(r["recall"] for r in scored),
+            "precision_mean": statistics.mean(r["precision"] for r in scored),
+        }
+        for group, scored in sorted(groups.items())
+    }
+
+
+def quality(result: dict) -> str:
+    return f"{result['recall']:>6.0%} {result['precision']:>6.0%}" if "recall" in result else f"{'-':>6} {'-':>6}"
+
+
+def main():
+    args = parse_args()
+    if args.save:
+        save_pages(args.corpus / args.group, args.save)
+        sys.exit(0)
+
+    pages = load_pages(args.corpus, args.fixtures)
+    before = measure(html2text_extract(), pages, args.repeat)
+    after = measure(bounded_extract(), pages, args.repeat)
+
+    print(
+        f"{'page':<40} {'html':>8} | {'html2text ms':>12} {'chars':>7} {'recall':>6} {'prec':>6}"
+        f" | {'extract ms':>10} {'chars':>7} {'recall':>6} {'prec':>6}"
+    )
+    for b, a in zip(before, after):
+        page = f"{b['group']}/{b['page']}"
+        print(
+            f"{page[:40]:<40} {b['html_chars']:>8,} | {b['ms']:>12.2f} {b['text_chars']:>7,} {quality(b)}"
+            f" | {a['ms']:>10.2f} {a['text_chars']:>7,} {quality(a)}"
+        )
+    report = {
+        "pages": len(pages),
+        "html2text": summary(before),
+        "extract": summary(after),
+        "groups": {"html2text": recall_by_group(before), "extract": recall_by_group(after)},
+    }
+    ratio = report["extract"]["text_chars_total"] / max(report["html2text"]["text_chars_total"], 1)
+    speedup = report["html2text"]["ms_mean"] / max(report["extract"]["ms_mean"], 1e-9)
+    print()
+    for name in ("html2text", "extract"):
+        s = report[name]
+        line = f"{name:<10} : 평균 {s['ms_mean']:.2f}ms, p95 {s['ms_p95']:.2f}ms, 평균 출력 {s['text_chars_mean']:,.0f}자"
+        if s["recall_mean"] is not None:
+            line += f", 본문 재현율 평균 {s['recall_mean']:.0%} (최저 {s['recall_min']:.0%}), 출력 중 본문 {s['precision_mean']:.0%}"
+        print(line)
+    print(f"속도 {speedup:.1f}배, 출력 크기 {ratio:.0%}")
+    if report["groups"]["extract"]:
+        print()
+        for group, extract in report["groups"]["extract"].items():
+            html2text = report["groups"]["html2text"][group]
+            print(
+                f"{group:<10} : 페이지 {extract['pages']}개, 본문 재현율 평균 {extract['recall_mean']:.0%}"
+                f" (최저 {extract['recall_min']:.0%}), 출력 중 본문 {extract['precision_mean']:.0%}"
+                f" | html2text 재현율 {html2text['recall_mean']:.0%}, 출력 중 본문 {html2text['precision_mean']:.0%}"
+            )
+        missing = [group for group in KOREAN_GROUPS if group not in report["groups"]["extract"]]
+        if missing:
+            print(
+                f"[extract] 실제 한국어 페이지 그룹({', '.join(missing)})에 gold 가 있는 페이지가 없습니다."
+                " synthetic 재현율은 한국어 뉴스/블로그 재현율로 볼 수 없습니다 (benchmarks/corpus/README.md 참고)."
+            )
+    if args.json:
+        report["pages_detail"] = {"html2text": before, "extract": after}
+        with open(args.json, "w") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import re
+import json
+import time
+import random
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from langchain_core.messages import AIMessage
+from configs.config import prompt_config
+
+# 라우팅 판단용 키워드 (실제 LLM 대신 사용자 요청문만 보고 판단)
+SEARCH_WORDS = ["알려줘", "뉴스", "주가", "날씨", "최신", "검색"]
+PERSONAL_WORDS = ["내 이름", "살아", "직업", "취미", "전공"]
+PREFERENCE_WORDS = ["짧게", "자세히", "이모지", "간단히"]
+CURRENT_MESSAGE = re.compile(r"\[현재 요청 메시지\] : (.*)", re.DOTALL)
+# 프로바이더 프롬프트 캐시 흉내 (앞부분이 이전 요청과 같으면 128 토큰 단위로 캐시, 1024 토큰 이상부터)
+PREFIX_BLOCK_CHARS = 256
+MIN_CACHED_CHARS = 2048
+
+PARAGRAPHS = [
+    "삼성전자는 3분기 연결 기준 영업이익이 9조 1천억원으로 잠정 집계됐다고 밝혔다. 반도체 부문의 메모리 가격 상승이 실적 개선을 이끌었다.",
+    "서울은 내일 대체로 맑겠으며 아침 최저기온은 5도, 낮 최고기온은 18도로 예보됐다. 미세먼지 농도는 보통 수준을 보이겠다.",
+    "코스피 지수는 외국인과 기관의 동반 매수에 힘입어 전 거래일보다 1.2% 오른 2,650선에서 마감했다.",
+    "인공지능 반도체 수요가 늘면서 고대역폭 메모리(HBM) 공급 경쟁이 치열해지고 있다. 주요 업체들은 생산 설비 투자를 확대하고 있다.",
+    "전문가들은 금리 인하 기대감이 커지면서 성장주 중심의 반등이 이어질 것으로 내다봤다.",
+]
+MENU = "홈 | 뉴스 | 경제 | 사회 | 로그인 | 회원가입 | 고객센터 | 이용약관 | 개인정보처리방침"
+
+
+def fixture_page(index: int) -> bytes:
+    """
+    Des:
+        검색 결과로 돌려줄 고정 HTML 페이지 (메뉴/광고 + 본문 문단)
+    """
+    rng = random.Random(index)
+    body = "".join(
+        f"<p>{rng.choice(PARAGRAPHS)} {rng.choice(PARAGRAPHS)}</p>" for _ in range(40)
+    )
+    html = f"""<html><head><meta charset="utf-8"><title>기사 {index}</title>
+<meta name="description" content="벤치마크용 기사 {index} 요약"></head>
+<body><nav>{MENU}</nav><div class="ad">광고 문의 02-000-0000</div>
+<article><h1>기사 {index}</h1>{body}</article><footer>{MENU}</footer></body></html>"""
+    return html.encode()
+
+
+class FakeChatModel:
+    """
+    Des:
+        ChatOpenAI 대체용 가짜 LLM
+            - latency 초 (±20%) 기다린 뒤 응답, usage_metadata 에 토큰 수 기록
+            - 라우팅(JSON / YES, NO), 검색어 생성, 답변 프롬프트를 구분해서 그럴듯한 응답 반환
+    """
+
+    latency = 0.5
+    output_tokens = 150
+    calls = 0
+    _seen_prefixes = set()
+
+    def __init__(self, *args, **kwargs):
+        self.model_name = kwargs.get("model", "fake")
+
+    async def ainvoke(self, prompt, **kwargs):
+        FakeChatModel.calls += 1
+        text = prompt if isinstance(prompt, str) else "\n".join(str(m.content) for m in prompt)
+        system = "" if isinstance(prompt, str) else str(prompt[0].content)
+        await asyncio.sleep(self.latency * random.uniform(0.8, 1.2))
+
+        match = CURRENT_MESSAGE.search(text)
+        current = match.group(1) if match else text[-200:]
+        decision = {
+            "is_search": any(word in current for word in SEARCH_WORDS),
+            "is_personal": any(word in current for word in PERSONAL_WORDS),
+            "is_preference": any(word in current for word in PREFERENCE_WORDS),
+        }
+        output_tokens = 10
+        if kwargs.get("response_format"):
+            content = json.dumps({k: "YES" if v else "NO" for k, v in decision.items()})
+        elif system == prompt_config.decide_search_prompt:
+            content = "YES" if decision["is_search"] else "NO"
+        elif system == prompt_config.decide_personal_prompt:
+            content = "YES" if decision["is_personal"] else "NO"
+        elif system == prompt_config.decide_preference_prompt:
+            content = "YES" if decision["is_preference"] else "NO"
+        elif isinstance(prompt, str) and "검색어:" in prompt:
+            content = current.strip().split("\n")[0][:30]
+        else:
+            output_tokens = self.output_tokens
+            content = "벤치마크 답변입니다. " * (self.output_tokens // 8)
+        input_tokens = len(text) // 2
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+                "input_token_details": {"cache_read": self._cached_chars(text) // 2},
+            },
+        )
+
+    @classmethod
+    def _cached_chars(cls, text: str) -> int:
+        cached = 0
+        for end in range(PREFIX_BLOCK_CHARS, len(text) + 1, PREFIX_BLOCK_CHARS):
+            prefix = hash(text[:end])
+            if cached == end - PREFIX_BLOCK_CHARS and prefix in cls._seen_prefixes:
+                cached = end
+            cls._seen_prefixes.add(prefix)
+        return cached if cached >= MIN_CACHED_CHARS else 0
+
+
+class FakeServer:
+    """
+    Des:
+        로컬 가짜 서버 (별도 스레드)
+            - GET /pages/<n> : 검색 결과 고정 페이지
+            - POST /callback/<id> : 카카오 callbackUrl 대체, 도착 시각 기록
+    """
+
+    def __init__(self, port: int):
+        self.port = port
+        self.arrivals = {}  # callback id -> (도착 시각, 응답 본문)
+        self._waiters = {}  # callback id -> (loop, future)
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if not self.path.startswith("/pages/"):
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = fixture_page(int(self.path.rsplit("/", 1)[1]))
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                server._arrive(self.path.rsplit("/", 1)[1], payload)
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+                self.wfile.write(b"{}")
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._httpd.shutdown()
+
+    def page_url(self, index: int) -> str:
+        return f"http://127.0.0.1:{self.port}/pages/{index}"
+
+    def callback_url(self, callback_id: str) -> str:
+        return f"http://127.0.0.1:{self.port}/callback/{callback_id}"
+
+    def expect(self, callback_id: str) -> asyncio.Future:
+        """
+        Des:
+            callback_id 로 콜백이 도착하면 완료되는 future 반환 함수
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            self._waiters[callback_id] = (loop, future)
+        return future
+
+    def _arrive(self, callback_id: str, payload: dict):
+        arrived_at = time.time()
+        with self._lock:
+            self.arrivals[callback_id] = (arrived_at, payload)
+            waiter = self._waiters.pop(callback_id, None)
+        if waiter:
+            loop, future = waiter
+            loop.call_soon_threadsafe(_resolve, future, arrived_at)
+
+
+def _resolve(future: asyncio.Future, value):
+    if not future.done():
+        future.set_result(value)
+
+
+def fake_search_factory(server: FakeServer, latency: float):
+    """
+    Des:
+        agoogle_search_scrape 대체 함수 생성 (latency 초 후 로컬 고정 페이지 링크 반환)
+    """
+
+    async def fake_search(search_term: str, SEARCH_RESULT_COUNT: int) -> list:
+        await asyncio.sleep(latency * random.uniform(0.8, 1.2))
+        start = abs(hash(search_term)) % 50
+        return [
+            {"title": f"기사 {start + i}", "link": server.page_url(start + i)}
+            for i in range(SEARCH_RESULT_COUNT)
+        ]
+
+    return fake_search
@@ -0,0 +1,233 @@
+"""
+Des:
+    /question -> get_answer -> 카카오 콜백 전체 경로 부하 테스트 (OpenAI, 구글 호출 없음)
+        - ChatOpenAI -> FakeChatModel (지연시간/토큰 수 설정 가능)
+        - 구글 검색 -> 로컬 고정 페이지 링크, 페이지 수집은 로컬 서버에서 실제 fetcher 로 수행
+        - 카카오 callbackUrl -> 로컬 가짜 서버 (도착 시각 기록)
+        - 사용자 N명이 멀티턴 시나리오를 진행하면서 요청 -> 콜백 도착까지 걸린 시간 측정
+
+    실행 (프로젝트 루트에서):
+        python -m benchmarks.load_test --users 50 --turns 6 --llm-latency 0.5
+        python -m benchmarks.load_test --set llm.max_concurrency=8 --set agent.routing_mode=fanout
+"""
+import os
+import ast
+import sys
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import tempfile
+import threading
+import resource
+import importlib.resources
+
+SCRIPTS = [
+    ["안녕", "내 이름은 민수야", "삼성전자 주가 알려줘", "그럼 반도체 전망은 어때?", "고마워"],
+    ["사용법", "오늘 서울 날씨 알려줘", "답변은 짧게 해줘", "코스피 뉴스 알려줘", "새로운 대화 시작할래요!", "hello 를 한국어로 번역해줘"],
+    ["나는 부산에 살아", "주말에 뭐하면 좋을까?", "최신 AI 반도체 뉴스 알려줘", "방금 내용 세 줄로 요약해줘"],
+    ["파이썬 리스트 정렬하는 법", "역순으로는?", "예제 코드도 보여줘"],
+]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="카카오 챗봇 부하 테스트 (가짜 LLM/검색/카카오 서버)")
+    parser.add_argument("--users", type=int, default=20, help="동시 사용자 수")
+    parser.add_argument("--turns", type=int, default=5, help="사용자별 요청 수 (시나리오 반복)")
+    parser.add_argument("--think-time", type=float, default=0.5, help="콜백 수신 후 다음 요청까지 대기 (초)")
+    parser.add_argument("--ramp-up", type=float, default=2.0, help="사용자 시작 시각을 분산시키는 구간 (초)")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="가짜 LLM 응답 지연 (초)")
+    parser.add_argument("--output-tokens", type=int, default=150, help="가짜 LLM 답변 토큰 수")
+    parser.add_argument("--search-latency", type=float, default=1.0, help="가짜 구글 검색 지연 (초)")
+    parser.add_argument("--timeout", type=float, default=60, help="콜백 대기 최대 시간 (초)")
+    parser.add_argument("--app-port", type=int, default=17860)
+    parser.add_argument("--fake-port", type=int, default=17861)
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="system_config 덮어쓰기 (예: llm.max_concurrency=8)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def use_temp_data_dir() -> str:
+    """
+    Des:
+        data/ 대신 임시 폴더를 쓰도록 importlib.resources.files 교체 (실제 사용자 DB를 건드리지 않음)
+            - 로그 파일도 같은 임시 폴더에 기록
+            - 프로젝트 모듈을 import 하기 전에 호출해야 함
+    """
+    data_dir = tempfile.mkdtemp(prefix="kakao-bench-")
+    original = importlib.resources.files
+    importlib.resources.files = lambda package: data_dir if package == "data" else original(package)
+    from configs.config import system_config
+
+    system_config.logging.path = os.path.join(data_dir, "kakao-agent.log")
+    return data_dir
+
+
+def apply_overrides(system_config, overrides: list[str]):
+    for override in overrides:
+        key, value = override.split("=", 1)
+        try:
+            value = ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            pass
+        *parents, name = key.split(".")
+        target = system_config
+        for parent in parents:
+            target = target[parent]
+        target[name] = value
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+
+
+def current_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+async def run_user(client, fake, user_index: int, args, results: list):
+    import httpx
+
+    rng = random.Random(args.seed + user_index)
+    script = SCRIPTS[user_index % len(SCRIPTS)]
+    user_id = f"bench-user-{user_index}"
+    await asyncio.sleep(rng.uniform(0, args.ramp_up))
+    for turn in range(args.turns):
+        utterance = script[turn % len(script)]
+        callback_id = uuid.uuid4().hex
+        arrival = fake.expect(callback_id)
+        sent_at = time.time()
+        try:
+            response = await client.post(
+                f"http://127.0.0.1:{args.app_port}/question",
+                json={
+                    "userRequest": {
+                        "user": {"id": user_id},
+                        "utterance": utterance,
+                        "callbackUrl": fake.callback_url(callback_id),
+                    }
+                },
+            )
+            response.raise_for_status()
+            arrived_at = await asyncio.wait_for(arrival, timeout=args.timeout)
+            results.append({"utterance": utterance, "seconds": arrived_at - sent_at, "ok": True})
+        except (asyncio.TimeoutError, httpx.HTTPError) as e:
+            results.append({"utterance": utterance, "seconds": time.time() - sent_at, "ok": False, "error": repr(e)})
+        await asyncio.sleep(args.think_time * rng.uniform(0.5, 1.5))
+
+
+async def run(args):
+    import httpx
+    import uvicorn
+    from configs.config import system_config
+    from benchmarks.fakes import FakeChatModel, FakeServer, fake_search_factory
+    import langchain_openai
+    import modules.agent
+    import app as app_module
+
+    FakeChatModel.latency = args.llm_latency
+    FakeChatModel.output_tokens = args.output_tokens
+    fake = FakeServer(args.fake_port)
+    fake.start()
+    langchain_openai.ChatOpenAI = FakeChatModel  # ChatbotAgent._create_llm 에서 import 할 때 가짜 모델을 가져감
+    modules.agent.agoogle_search_scrape = fake_search_factory(fake, args.search_latency)
+
+    server = uvicorn.Server(
+        uvicorn.Config(app_module.app, host="127.0.0.1", port=args.app_port, log_level="warning")
+    )
+    server_thread = threading.Thread(target=server.run, daemon=True)
+    server_thread.start()
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    rss_before = current_rss_mb()
+    results = []
+    START_TIME = time.time()
+    async with httpx.AsyncClient(timeout=10, limits=httpx.Limits(max_connections=args.users)) as client:
+        await asyncio.gather(
+            *[run_user(client, fake, i, args, results) for i in range(args.users)]
+        )
+        elapsed = time.time() - START_TIME
+        stats = {}
+        for name in ["callback", "llm", "inbox", "agents"]:
+            stats[name] = (await client.get(f"http://127.0.0.1:{args.app_port}/stats/{name}")).json()
+
+    server.should_exit = True
+    server_thread.join(timeout=30)
+    fake.stop()
+
+    ok = [r["seconds"] for r in results if r["ok"]]
+    return {
+        "config": {k: v for k, v in vars(args).items() if k != "json"},
+        "turns": len(results),
+        "completed": len(ok),
+        "failed": len(results) - len(ok),
+        "elapsed_seconds": elapsed,
+        "throughput_turns_per_second": len(ok) / elapsed if elapsed else 0.0,
+        "time_to_callback": {
+            "p50": percentile(ok, 50),
+            "p95": percentile(ok, 95),
+            "p99": percentile(ok, 99),
+            "max": max(ok) if ok else 0.0,
+        },
+        "llm_calls": FakeChatModel.calls,
+        "llm_calls_per_turn": FakeChatModel.calls / len(ok) if ok else 0.0,
+        "rss_mb": {
+            "before": rss_before,
+            "after": current_rss_mb(),
+            # ru_maxrss: 리눅스는 KB, macOS 는 bytes
+            "peak": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            / (1024 * 1024 if sys.platform == "darwin" else 1024),
+        },
+        "stats": stats,
+    }
+
+
+def print_report(report: dict):
+    ttc = report["time_to_callback"]
+    rss = report["rss_mb"]
+    print()
+    print(f"요청 수          : {report['turns']} (성공 {report['completed']}, 실패 {report['failed']})")
+    print(f"소요 시간        : {report['elapsed_seconds']:.1f}s")
+    print(f"처리량           : {report['throughput_turns_per_second']:.2f} turns/s")
+    print(f"콜백 도착 시간   : p50 {ttc['p50']:.2f}s | p95 {ttc['p95']:.2f}s | p99 {ttc['p99']:.2f}s | max {ttc['max']:.2f}s")
+    print(f"LLM 호출         : {report['llm_calls']} ({report['llm_calls_per_turn']:.2f} / turn)")
+    print(f"RSS              : {rss['before']:.0f}MB -> {rss['after']:.0f}MB (peak {rss['peak']:.0f}MB)")
+    llm = report["stats"]["llm"]
+    print(f"프롬프트 캐시    : 입력 {llm['prompt_tokens']} 토큰 중 {llm['cached_tokens']} 캐시 ({llm['prompt_cache_hit_rate']:.1%})")
+    callback = report["stats"]["callback"]
+    print(f"콜백 전송        : delivered {callback['delivered']}, retries {callback['retries']}, dropped {callback['dropped']}")
+
+
+def main():
+    args = parse_args()
+    random.seed(args.seed)
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    data_dir = use_temp_data_dir()
+    from configs.config import system_config
+
+    system_config.browser_pool.enabled = False
+    apply_overrides(system_config, args.set)
+    print(f"[load_test] data dir : {data_dir}")
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
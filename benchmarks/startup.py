@@ -0,0 +1,106 @@
+"""
+Des:
+    서버 시작 시간 측정
+        - import : 새 프로세스에서 `import app` 에 걸린 시간
+        - ready : import + lifespan 시작(워밍업, 콜백 대기열) 까지 걸린 시간
+        - 검색/본문 추출용 무거운 모듈(playwright, bs4, ...)이 import 시점에 로드되면 실패
+        - import 시간 중앙값이 예산(startup.import_budget)을 넘으면 실패 (종료 코드 1)
+        - 같은 검사를 tests/test_startup.py 에서 pytest 로 실행
+
+    실행 (프로젝트 루트에서):
+        python -m benchmarks.startup
+        python -m benchmarks.startup --runs 10 --budget 1.2 --no-ready
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# app import 시점에 로드되면 안 되는 모듈 (첫 검색/본문 추출시 로드)
+LAZY_MODULES = [
+    "playwright",
+    "bs4",
+    "html2text",
+    "langchain_community",
+    "langchain_openai",
+    "openai",
+]
+
+CHILD = """
+import sys, json, time, asyncio
+from benchmarks.load_test import use_temp_data_dir
+use_temp_data_dir()
+START_TIME = time.perf_counter()
+import app
+import_s = time.perf_counter() - START_TIME
+loaded = [name for name in {lazy} if name in sys.modules]
+ready_s = None
+if {ready}:
+    async def start():
+        async with app.app.router.lifespan_context(app.app):
+            return time.perf_counter() - START_TIME
+    ready_s = asyncio.run(start())
+print(json.dumps({{"import_s": import_s, "ready_s": ready_s, "loaded": loaded}}))
+"""
+
+
+def parse_args():
+    from configs.config import system_config
+
+    parser = argparse.ArgumentParser(description="app import / 시작 시간 측정")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=system_config.startup.import_budget, help="import 시간 예산 (초)")
+    parser.add_argument("--no-ready", action="store_true", help="lifespan 시작 시간은 측정하지 않음")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    return parser.parse_args()
+
+
+def measure(ready: bool) -> dict:
+    env = {**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "benchmark")}
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(lazy=LAZY_MODULES, ready=ready)],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=ROOT,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    args = parse_args()
+    results = [measure(ready=not args.no_ready) for _ in range(args.runs)]
+    import_s = [r["import_s"] for r in results]
+    ready_s = [r["ready_s"] for r in results if r["ready_s"] is not None]
+    loaded = sorted({name for r in results for name in r["loaded"]})
+    report = {
+        "runs": args.runs,
+        "budget_s": args.budget,
+        "import_s": {"median": statistics.median(import_s), "min": min(import_s), "max": max(import_s)},
+        "ready_s": {"median": statistics.median(ready_s), "max": max(ready_s)} if ready_s else None,
+        "eager_heavy_modules": loaded,
+    }
+    print(f"import 시간      : 중앙값 {report['import_s']['median']:.3f}s (min {min(import_s):.3f}s, max {max(import_s):.3f}s, 예산 {args.budget:.2f}s)")
+    if ready_s:
+        print(f"시작 완료 시간   : 중앙값 {report['ready_s']['median']:.3f}s (import + 워밍업)")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    failed = False
+    if loaded:
+        print(f"[startup] import 시점에 로드된 무거운 모듈 : {', '.join(loaded)}")
+        failed = True
+    if report["import_s"]["median"] > args.budget:
+        print("[startup] import 시간이 예산을 초과했습니다.")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
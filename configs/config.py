@@ -34,6 +34,28 @@ prompt_config.decide_preference_prompt = """현재 사용자 요청문에 대해
    - 이모지를 사용하지 않는것을 선호
 답변은 무조건 YES 또는 NO로 출력하세요."""
 
+prompt_config.decide_route_prompt = """현재 사용자 요청문에 대해 아래 세 가지를 한번에 판단하세요.
+
+1. is_personal: 현재 사용자 요청문에서 사용자의 개인정보가 있는지 판단하세요.
+   예를들어 개인정보는 이름, 위치, 관심사, 취미, 직업, 전공, 가족관계 등이 있습니다.
+   무조건 사용자가 직접적으로 언급한 사실적인 정보만 고려합니다. 추측이나 추론을 하지 마세요.
+2. is_preference: 현재 사용자 요청문에 사용자의 답변 선호도가 있는지 판단하세요.
+   예를들어 답변 선호도에는 다음과 같은 것들이 있습니다.
+   - 간결하고 명확한 답변을 선호
+   - 맥락을 고려한 맞춤형 응답을 선호
+   - 친근하고 인간적인 대화를 선호
+   - 구체적이고 실행 가능한 정보를 선호
+   - 적절한 유머나 위트를 선호
+   - 상세하고 심층적인 답변을 선호
+   - 다단계로 제공되는 답변을 선호
+   - 중립적이고 객관적인 태도를 선호
+   - 이모지를 적절히 사용하는것을 선호
+   - 이모지를 사용하지 않는것을 선호
+3. is_search: 현재 사용자 요청문에 대해 웹 검색을 통해 최신자료를 검색해야 답변이 가능한지 판단하세요.
+
+각 값은 무조건 YES 또는 NO로 판단하고, 반드시 아래 JSON 형식으로만 출력하세요. (YES 는 true, NO 는 false 로 출력해도 됩니다.)
+{"is_personal": "YES 또는 NO", "is_preference": "YES 또는 NO", "is_search": "YES 또는 NO"}"""
+
 #### 저장 프롬프트
 prompt_config.create_memory_prompt ="""당신은 사용자의 응답을 개인화하기 위해 사용자에 대한 정보를 수집하고 있습니다.
 
@@ -103,28 +125,55 @@ prompt_config.create_preference_prompt ="""당신은 사용자의 응답을 개
 """
 
 #### 답변 프롬프트
-prompt_config.answer_prompt = """당신은 사용자 요청에 대해 답변을 수행하는 유용한 챗봇입니다.
+# 프롬프트 캐시(앞부분이 같은 요청은 캐시된 토큰으로 처리)가 잘 맞도록
+# 고정 지침 -> 사용자 정보 -> 대화 요약 -> 대화 기록 -> 현재 요청(검색 참고내용) 순서로 조립
+prompt_config.answer_prompt = """
+당신은 사용자 요청에 대해 답변을 수행하는 유용한 챗봇입니다.
 
 아래 [사용자 정보]와 [사용자 답변 선호도]를 참고해서 답변을 수행하세요.
+"""
 
+prompt_config.user_profile = """
 [사용자 정보]:
 {memory}
 
 [사용자 답변 선호도]:
 {preference}
+"""
 
-답변:"""
+prompt_config.conversation_summary = """
+[이전 대화 요약]:
+{summary}
+"""
 
 prompt_config.answer_with_context = """[참고내용]을 참고해서 [사용자 요청문]에 대한 답변을 생성하세요. 만약 참고내용이 없다면, 당신이 아는 내용을 답변하세요.
 
-[사용자 요청문]: 
-{query}
-
 [참고내용]: 
 {context}
 
+[사용자 요청문]: 
+{query}
+
 답변 : """
 
+#### 대화 요약 프롬프트
+prompt_config.summarize_conversation_prompt = """당신은 사용자와 챗봇의 대화를 요약하고 있습니다.
+
+지침:
+1. 아래의 대화 기록을 [현재 대화 요약]에 이어서 하나의 요약으로 병합하세요.
+2. 이후 대화에서 참고할 수 있도록 사용자가 요청한 내용, 답변의 핵심 사실, 합의된 내용, 아직 해결되지 않은 요청 위주로 작성하세요.
+3. 검색 출처(링크)와 인사말 같은 불필요한 내용은 제외하세요.
+4. 요약은 명확한 불릿 리스트 형식으로, 최대 15줄 이내로 작성하세요.
+5. [현재 대화 요약] 내용이 비어 있을수도 있습니다.
+
+[현재 대화 요약]:
+{summary}
+
+[대화 기록]:
+{messages}
+
+요약:"""
+
 #### 웹 검색 관련 프롬프트
 prompt_config.generate_search_keyword = f"""다음 사용자 요청문을 기반으로 웹에서 자료 검색을 하려고한다.
 
@@ -133,10 +182,136 @@ prompt_config.generate_search_keyword = f"""다음 사용자 요청문을 기반
 2. 검색어는 반드시 한국어로 작성한다.
 3. 오늘 날짜 : {datetime.now().strftime("%Y-%m-%d")}
 
-이전 검색어:
-{{previous_search_keyword}}
-
 사용자 요청문: 
 {{query}}
 
-검색어:"""
\ No newline at end of file
+이전 검색어:
+{{previous_search_keyword}}
+
+검색어:"""
+
+#### 시스템 설정
+system_config = ConfigDict()
+
+# 웹 검색용 헤드리스 브라우저 풀
+system_config.browser_pool = ConfigDict()
+system_config.browser_pool.enabled = True  # False 이면 검색마다 별도 프로세스에서 브라우저를 새로 실행 (디버깅용, 검색 1건당 Chromium 실행 비용 발생)
+system_config.browser_pool.size = 2  # 미리 띄워둘 컨텍스트/페이지 수 (= 동시 검색 수)
+system_config.browser_pool.max_uses = 30  # 컨텍스트 재사용 횟수 (초과시 새 컨텍스트로 교체)
+system_config.browser_pool.lease_timeout = 30  # 페이지 대여 대기 시간 (초)
+system_config.browser_pool.search_timeout = 60  # 검색 1건 최대 소요 시간 (초)
+
+# 검색 결과 페이지 수집
+system_config.fetcher = ConfigDict()
+system_config.fetcher.max_connections = 20  # 공용 HTTP 클라이언트 최대 커넥션 수
+system_config.fetcher.per_host_limit = 2  # 호스트별 동시 요청 수
+system_config.fetcher.timeout = 10  # 요청 1건 타임아웃 (초)
+system_config.fetcher.max_bytes = 1024 * 1024  # 페이지당 최대 다운로드 크기 (넘으면 중단)
+system_config.fetcher.max_text_chars = 20000  # 페이지당 추출할 본문 최대 길이
+
+# 검색 결과/페이지 내용 캐시 (TTL + LRU)
+system_config.cache = ConfigDict()
+system_config.cache.persist = False  # True 이면 data/cache.db 에 저장해서 재시작 후에도 유지
+system_config.cache.flush_interval = 1  # 디스크 반영 주기 (초, persist=True 일 때)
+system_config.cache.purge_interval = 600  # 디스크에서 만료 항목 삭제 주기 (초, persist=True 일 때)
+system_config.cache.search = ConfigDict()
+system_config.cache.search.ttl = 600  # 검색어 -> 검색 결과 (초)
+system_config.cache.search.max_entries = 2000
+system_config.cache.search.max_bytes = 8 * 1024 * 1024
+system_config.cache.content = ConfigDict()
+system_config.cache.content.ttl = 3600  # URL -> 추출된 내용 (초)
+system_config.cache.content.max_entries = 1000
+system_config.cache.content.max_bytes = 64 * 1024 * 1024
+system_config.cache.llm = ConfigDict()
+system_config.cache.llm.ttl = 3600  # 모델 + 프롬프트 -> LLM 응답 (초, 라우팅/검색어 생성처럼 cache=True 로 호출한 경우만)
+system_config.cache.llm.max_entries = 20000
+system_config.cache.llm.max_bytes = 16 * 1024 * 1024
+
+# 에이전트
+system_config.agent = ConfigDict()
+system_config.agent.routing_mode = "combined"  # combined: 라우팅 1회 호출(JSON), fanout: 개인정보/선호도/검색 판단 3회 호출
+system_config.agent.memory_write = "background"  # background: 개인정보/선호도 갱신을 답변 후 백그라운드로 처리, inline: 답변 전에 갱신 (이전 방식)
+system_config.agent.memory_mode = "summary"  # summary: 오래된 대화는 요약으로 유지, truncate: LIMIT_LENGTH 초과시 오래된 절반 삭제 (이전 방식)
+system_config.agent.max_messages = 8  # (summary) 대화 기록이 이 수를 넘으면 오래된 메시지를 요약에 합치고 삭제 (답변 후 백그라운드로 요약, 다음 턴에 반영)
+system_config.agent.keep_messages = 4  # (summary) 요약하지 않고 그대로 남겨둘 최근 메시지 수
+
+# 사용자별 에이전트 보관 (app.py)
+system_config.registry = ConfigDict()
+system_config.registry.max_agents = 500  # 최대 보관 에이전트 수 (초과시 가장 오래 사용하지 않은 에이전트 제거)
+system_config.registry.idle_ttl = 30 * 60  # 마지막 요청 후 이 시간(초)이 지나면 제거
+system_config.registry.base_agent_bytes = 4 * 1024  # 에이전트 1개 기본 메모리 추정치 (그래프/LLM 클라이언트는 공용이므로 config 정도)
+
+# 사용자 정보 DB (sqlite3)
+system_config.db = ConfigDict()
+system_config.db.pool_size = 4  # 커넥션 수 (= DB 작업 스레드 수)
+system_config.db.synchronous = "NORMAL"  # WAL 모드에서는 NORMAL 로도 커밋된 데이터가 손상되지 않음
+system_config.db.busy_timeout = 5000  # 쓰기 잠금 대기 시간 (ms)
+
+# 사용자 정보 캐시 (읽기는 메모리에서, 쓰기는 모아서 주기적으로 DB 반영)
+system_config.profile_cache = ConfigDict()
+system_config.profile_cache.max_entries = 10000  # 메모리에 보관할 사용자 수 (DB 반영 대기중인 사용자는 제거하지 않음)
+system_config.profile_cache.flush_interval = 5  # DB 반영 주기 (초)
+
+# 대화 기록 체크포인터
+system_config.checkpoint = ConfigDict()
+system_config.checkpoint.backend = "sqlite"  # sqlite: data/checkpoints.db 에 저장 (재시작 후에도 유지), memory: MemorySaver
+system_config.checkpoint.max_checkpoints = 2  # thread 별로 남겨둘 최근 체크포인트 수 (sqlite)
+
+# 카카오 콜백 전달
+system_config.callback = ConfigDict()
+system_config.callback.mode = "direct"  # direct: 카카오 callbackUrl 로 바로 전달, webhook: 아래 webhook_url(/webhook)을 거쳐서 전달 (이전 방식)
+system_config.callback.webhook_url = "https://changwoo.ngrok.dev/webhook"
+system_config.callback.timeout = 10  # 콜백 요청 타임아웃 (초)
+system_config.callback.max_connections = 100  # 공용 HTTP 클라이언트 최대 커넥션 수
+system_config.callback.concurrency = 20  # 동시에 전송하는 콜백 수
+system_config.callback.queue_size = 10000  # 전송 대기열 최대 길이
+system_config.callback.window = 55  # 카카오 callbackUrl 유효시간(1분) 중 재시도에 사용할 시간 (초, 요청 수신 기준)
+system_config.callback.backoff_base = 0.5  # 재시도 대기 시간 기본값 (초, 재시도마다 2배)
+system_config.callback.backoff_max = 8  # 재시도 대기 시간 최대값 (초)
+
+# 사용자별 요청 대기열
+system_config.inbox = ConfigDict()
+system_config.inbox.max_merge = 5  # 답변 생성 중에 들어온 메시지를 다음 실행에서 최대 몇 건까지 합칠지
+
+# LLM 호출 창구 (모든 노드 공용)
+system_config.llm = ConfigDict()
+system_config.llm.model = "gpt-4o"
+system_config.llm.max_concurrency = 16  # 동시에 진행하는 LLM 호출 수
+system_config.llm.rpm = 500  # 분당 요청 수 한도 (OpenAI 계정 한도에 맞게 설정)
+system_config.llm.tpm = 30000  # 분당 토큰 수 한도 (OpenAI 계정 한도에 맞게 설정)
+system_config.llm.max_retries = 5  # 429/타임아웃/5xx 재시도 횟수
+system_config.llm.backoff_base = 1  # 재시도 대기 시간 기본값 (초, 재시도마다 2배)
+system_config.llm.backoff_max = 20  # 재시도 대기 시간 최대값 (초)
+system_config.llm.chars_per_token = 2  # 호출 전 토큰 수 추정용 (한국어 기준 보수적으로)
+system_config.llm.output_tokens = 512  # 호출 전 예약해두는 출력 토큰 수 (응답 후 실제 사용량으로 보정)
+system_config.llm.prices = {"input": 2.5, "cached_input": 1.25, "output": 10.0}  # 100만 토큰당 가격 (USD, 예상 비용 집계용)
+system_config.llm.prompt_cache_key = False  # 답변 호출에 사용자별 prompt_cache_key 전달 (같은 사용자 요청이 같은 프롬프트 캐시를 쓰도록, 사용자 ID 는 해시, extra_body 로 전달하므로 이 값을 지원하는 API/모델에서만 켤 것)
+
+# 검색 참고내용 (답변 프롬프트에 넣을 문단 선택)
+system_config.search_context = ConfigDict()
+system_config.search_context.budget_tokens = 3000  # 참고내용 최대 토큰 수 (추정치, system_config.llm.chars_per_token 기준)
+system_config.search_context.passage_chars = 600  # 문단 최대 길이 (글자)
+system_config.search_context.min_passage_chars = 40  # 이보다 짧은 조각(메뉴, 버튼 문구 등)은 제외
+
+# 배포 (워커 프로세스 수)
+system_config.deployment = ConfigDict()
+system_config.deployment.mode = "single"  # single: 워커 1개 (세션 상태를 메모리에 보관), multi: 워커 여러개 (세션 상태를 data/sessions.db 에 공유)
+system_config.deployment.workers = 4  # (multi) uvicorn 워커 프로세스 수, LLM rpm/tpm 한도는 워커 수로 나눠서 적용
+system_config.deployment.lock_ttl = 30  # (multi) 사용자별 잠금 유지 시간 (초, 잡고 있는 동안 ttl/3 마다 연장, 잠금을 잡은 워커가 죽으면 이후 다른 워커가 가져감)
+system_config.deployment.lock_poll_interval = 0.05  # (multi) 다른 워커가 잡고 있는 잠금 재확인 간격 (초)
+
+# 로그 (loguru, 요청 처리 중에는 대기열에만 넣고 별도 스레드에서 기록)
+system_config.logging = ConfigDict()
+system_config.logging.level = "INFO"  # 파일 로그 레벨 (DEBUG 이면 프롬프트/DB 조회 결과까지 기록)
+system_config.logging.path = "logs/kakao-agent.log"  # JSON lines 형식 (multi 모드에서는 파일명에 워커 pid 추가)
+system_config.logging.rotation = "100 MB"
+system_config.logging.retention = 10  # 보관할 이전 로그 파일 수
+system_config.logging.console_level = "WARNING"  # 터미널 로그 레벨 ("OFF" 이면 터미널 출력 안 함)
+system_config.logging.max_chars = 300  # 프롬프트/본문을 이 길이로 잘라서 기록
+system_config.logging.sample_rate = 0.01  # 프롬프트/본문을 자르지 않고 전부 기록할 비율
+
+# 서버 시작
+system_config.startup = ConfigDict()
+system_config.startup.warmup = True  # 트래픽을 받기 전에 LLM 클라이언트/DB/그래프 준비 (FastAPI lifespan)
+system_config.startup.warm_browser = False  # 브라우저 풀까지 미리 실행 (첫 검색이 빨라지지만 시작이 느려짐)
+system_config.startup.import_budget = 1.5  # benchmarks/startup.py 에서 허용하는 app import 시간 (초)
@@ -5,16 +5,14 @@ from langchain_core.messages import (
     ToolMessage,
     RemoveMessage,
 )
-from langchain_openai import ChatOpenAI
 from langchain_core.runnables import RunnableConfig
 from langgraph.graph import MessagesState, START, StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.store.base import BaseStore
 from langgraph.store.memory import InMemoryStore
-from configs.config import prompt_config
+from configs.config import prompt_config, system_config
 from utils.util import *
-
-set_env()
+from utils.logger import logger, log_context, clip
 
 
 import os
@@ -1,22 +1,70 @@
+import os
+import json
+import hashlib
+import asyncio
+import time
+import uuid
+import threading
+from importlib.resources import files
 from . import *
-from utils.util import google_search_scrape, extract_content
-from modules.db import UserData
+from utils.util import agoogle_search_scrape
+from utils.fetcher import afetch_contents
+from utils.ranking import build_search_context
+from utils.metrics import start_trace, timer, track_node, SEARCH_STEP_SECONDS
+from modules.db import UserData, UserProfileCache
+from modules.checkpoint import BoundedSqliteSaver
+from modules.store import SqliteStore, SqliteLeaseLock
+from modules.llm import LLMGateway, PRIORITY_ANSWER, PRIORITY_ROUTING, PRIORITY_MEMORY
 
 class State(MessagesState):
     is_search: str
     is_personal: str
     is_preference: str
+    previous_human_messages_query: str  # 사용자 요청메시지 취합 (라우팅 등에서 사용)
+    search_keyword: str  # 직전 검색어
+    main_context: str  # 이번 턴 검색 참고내용
+    suffix_context: str  # 이번 턴 검색 출처
+    summary: str  # 대화 기록에서 삭제된 메시지들의 요약 (memory_mode == "summary")
+
 
 class ChatbotAgent:
-    def __init__(self):
-        self.LIMIT_LENGTH = 12
-        self.SEARCH_RESULT_COUNT = 5
+    """
+    Des:
+        사용자별 챗봇 에이전트
+            - 컴파일된 그래프, 체크포인터, 스토어, LLM 클라이언트는 프로세스 전체에서 공유
+            - 사용자 구분은 config 의 thread_id / user_id 로만 이루어짐
+    """
+
+    LIMIT_LENGTH = 12
+    SEARCH_RESULT_COUNT = 5
+    _shared = {}  # 프로세스 공용 자원 (llm, user_data, checkpointer, store, profile_lock)
+    _graphs = {}  # routing_mode -> 컴파일된 그래프
+    _memory_tasks = {}  # user_id -> 마지막으로 등록된 사용자 정보 갱신 작업 (memory_write == "background")
+    _summary_tasks = {}  # thread_id -> 백그라운드 대화 요약 작업 (memory_mode == "summary")
+    _lock = threading.Lock()
+
+    def __init__(self, routing_mode: str = None):
+        self.ROUTING_MODE = routing_mode or system_config.agent.routing_mode
         self.system_prompt = prompt_config.system_message
-        self.search_keyword = ""
-        self.llm = ChatOpenAI(model="gpt-4o")
         self.config = {"configurable": {"thread_id": "default", "user_id": "default"}}
-        self.user_data = UserData()
-        self._build_graph()
+        with ChatbotAgent._lock:
+            if not ChatbotAgent._shared:
+                ChatbotAgent._shared.update(
+                    llm=ChatbotAgent._create_llm(),
+                    profiles=UserProfileCache(
+                        UserData(),
+                        max_entries=system_config.profile_cache.max_entries,
+                        flush_interval=system_config.profile_cache.flush_interval,
+                        # 워커가 여러개면 다른 워커의 변경을 바로 볼 수 있도록 캐시하지 않고 DB에 바로 씀
+                        write_through=system_config.deployment.mode == "multi",
+                    ),
+                    checkpointer=ChatbotAgent._create_checkpointer(),
+                    store=ChatbotAgent._create_store(),
+                    profile_lock=ChatbotAgent._create_profile_lock(),
+                )
+        self.llm = ChatbotAgent._shared["llm"]
+        self.profiles = ChatbotAgent._shared["profiles"]
+        self.graph = self._build_graph()
 
     async def get_response(self, question: str) -> str:
         """
@@ -28,299 +76,800 @@ class ChatbotAgent:
             답변
         """
         question = HumanMessage(content=question)
-        return self._call_graph([question])["messages"][-1].content
+        trace = start_trace()
+        response = (await self._call_graph([question]))["messages"][-1].content
+        logger.info(
+            "단계별 기록 : {}",
+            ", ".join(
+                f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}"
+                for key, value in trace.items()
+            ),
+            trace=trace,
+        )
+        return response
 
     def set_config(self, user_id: str):
         """
         Des:
             config 설정 함수
+                - 카톡은 채팅창 여러개를 띄울수없기에 사용자당 대화 thread 는 하나
+                - '새로운 대화' 요청시 thread_id 만 바꾸므로, 현재 thread_id 는 스토어에 기록해둠
         Args:
             user_id: 사용자 ID
         """
+        session = self.graph.store.get(namespace=("sessions", user_id), key="thread_id")
         self.config = {
             "configurable": {
-                "thread_id": user_id,  # 어차피 카톡은 채팅창 여러개를 띄울수없기에, thread 값도 user_id로 고정
+                "thread_id": session.value["thread_id"] if session else user_id,
                 "user_id": user_id,
             }
         }
 
+    async def refresh_config(self):
+        """
+        Des:
+            스토어에 기록된 현재 thread_id 를 다시 읽는 함수
+                - 워커가 여러개일 때 다른 워커에서 '새로운 대화'로 thread_id 가 바뀌었을 수 있음
+        """
+        user_id = self.config["configurable"]["user_id"]
+        session = await self.graph.store.aget(namespace=("sessions", user_id), key="thread_id")
+        if session:
+            self.config["configurable"]["thread_id"] = session.value["thread_id"]
+
+    async def reset_conversation(self):
+        """
+        Des:
+            대화 초기화 함수
+                - 그래프를 다시 만들지 않고 새 thread_id 로 교체
+                - 사용자 정보/답변 선호도(롱텀 메모리)는 유지
+        """
+        user_id = self.config["configurable"]["user_id"]
+        previous_thread_id = self.config["configurable"]["thread_id"]
+        thread_id = f"{user_id}:{uuid.uuid4().hex[:8]}"
+        await self.graph.store.aput(
+            namespace=("sessions", user_id),
+            key="thread_id",
+            value={"thread_id": thread_id},
+        )
+        self._cancel_summary(previous_thread_id)
+        checkpointer = self.graph.checkpointer
+        adelete_thread = getattr(checkpointer, "adelete_thread", None)
+        try:
+            if adelete_thread is not None:
+                await adelete_thread(previous_thread_id)
+            elif isinstance(checkpointer, MemorySaver):
+                self._delete_memory_thread(checkpointer, previous_thread_id)
+        except NotImplementedError:
+            pass
+        self.config = {"configurable": {"thread_id": thread_id, "user_id": user_id}}
+        logger.info("대화 초기화 완료", thread_id=thread_id)
+
+    @classmethod
+    async def drain_background(cls):
+        """
+        Des:
+            등록된 사용자 정보 갱신 작업이 모두 끝날 때까지 기다리는 함수 (서버 종료시)
+        """
+        while cls._memory_tasks:
+            await asyncio.gather(*list(cls._memory_tasks.values()), return_exceptions=True)
+
+    @classmethod
+    def shutdown(cls):
+        """
+        Des:
+            서버 종료시 호출되는 함수
+                - 아직 DB에 반영되지 않은 사용자 정보 저장
+        """
+        if "profiles" in cls._shared:
+            cls._shared["profiles"].close()
+
+    @classmethod
+    def llm_stats(cls) -> dict:
+        """
+        Des:
+            공용 LLM 호출 창구 통계 (호출 수, 재시도, 429 횟수, 대기 수) 반환 함수
+        """
+        return cls._shared["llm"].stats() if "llm" in cls._shared else {}
+
+    @staticmethod
+    def _workers() -> int:
+        return system_config.deployment.workers if system_config.deployment.mode == "multi" else 1
+
+    @classmethod
+    async def warmup(cls):
+        """
+        Des:
+            트래픽을 받기 전에 공용 자원을 준비하는 함수 (서버 시작시)
+                - LLM 클라이언트(openai import), 사용자 DB, 체크포인터, 스토어 생성 및 그래프 컴파일
+                - startup.warm_browser 이면 브라우저 풀도 미리 실행 (아니면 첫 검색시 실행)
+        """
+        START_TIME = time.time()
+        await asyncio.to_thread(cls)
+        if system_config.startup.warm_browser and system_config.browser_pool.enabled:
+            from utils.browser import get_browser_pool
+
+            await asyncio.to_thread(get_browser_pool().start)
+        logger.info("워밍업 완료 ({:.2f}s)", time.time() - START_TIME)
+
+    @staticmethod
+    def _create_llm() -> LLMGateway:
+        """
+        Des:
+            공용 LLM 호출 창구 생성 함수
+                - langchain_openai/openai 는 import 가 느려서 첫 에이전트 생성(또는 워밍업)시 불러옴
+        """
+        from langchain_openai import ChatOpenAI
+
+        set_env()
+        return LLMGateway(
+            # 재시도는 게이트웨이에서 처리 (429 발생시 모든 호출이 함께 물러나도록)
+            ChatOpenAI(
+                model=system_config.llm.model,
+                max_retries=0,
+                include_response_headers=True,
+            ),
+            max_concurrency=system_config.llm.max_concurrency,
+            rpm=system_config.llm.rpm / ChatbotAgent._workers(),
+            tpm=system_config.llm.tpm / ChatbotAgent._workers(),
+            max_retries=system_config.llm.max_retries,
+            backoff_base=system_config.llm.backoff_base,
+            backoff_max=system_config.llm.backoff_max,
+            chars_per_token=system_config.llm.chars_per_token,
+            output_tokens=system_config.llm.output_tokens,
+            prices=system_config.llm.prices,
+        )
+
+    @staticmethod
+    def _create_checkpointer():
+        """
+        Des:
+            system_config.checkpoint.backend 에 맞는 체크포인터 생성 함수
+                - deployment.mode == "multi" 이면 워커끼리 공유해야 하므로 항상 sqlite
+        """
+        if (
+            system_config.checkpoint.backend == "sqlite"
+            or system_config.deployment.mode == "multi"
+        ):
+            return BoundedSqliteSaver(
+                db_path=os.path.join(files("data"), "checkpoints.db"),
+                max_checkpoints=system_config.checkpoint.max_checkpoints,
+                busy_timeout=system_config.db.busy_timeout,
+            )
+        return MemorySaver()
+
+    @staticmethod
+    def _create_store():
+        """
+        Des:
+            롱텀 메모리/세션(thread_id) 스토어 생성 함수
+                - deployment.mode == "multi" 이면 워커끼리 공유하는 data/sessions.db
+        """
+        if system_config.deployment.mode == "multi":
+            return SqliteStore(db_path=os.path.join(files("data"), "sessions.db"))
+        return InMemoryStore()
+
+    @staticmethod
+    def _create_profile_lock():
+        """
+        Des:
+            사용자 정보 갱신용 잠금 생성 함수
+                - deployment.mode == "multi" 이면 워커끼리 같은 사용자 정보를 동시에 갱신하지 않도록 data/sessions.db 잠금 사용
+        """
+        if system_config.deployment.mode == "multi":
+            return SqliteLeaseLock(
+                db_path=os.path.join(files("data"), "sessions.db"),
+                ttl=system_config.deployment.lock_ttl,
+                poll_interval=system_config.deployment.lock_poll_interval,
+            )
+        return None
+
+    def release(self):
+        """
+        Des:
+            에이전트 제거시 호출되는 함수
+                - 메모리 체크포인터를 사용할 경우 이 사용자의 대화 기록과 롱텀 메모리 사본을 정리
+                - 사용자 정보/답변 선호도는 DB에 있으므로 다시 오면 _node_initialize 에서 복구
+        """
+        user_id = self.config["configurable"]["user_id"]
+        self._cancel_summary(self.config["configurable"]["thread_id"])
+        if isinstance(self.graph.checkpointer, MemorySaver):
+            self._delete_memory_thread(self.graph.checkpointer, self.config["configurable"]["thread_id"])
+        if isinstance(self.graph.store, InMemoryStore):
+            for key in ["personal_info", "personal_preference"]:
+                self.graph.store.delete(namespace=("memories", user_id), key=key)
+
+    @staticmethod
+    def _delete_memory_thread(checkpointer: MemorySaver, thread_id: str):
+        """
+        Des:
+            메모리 체크포인터에서 thread 하나의 기록을 삭제하는 함수
+                - langgraph-checkpoint 버전에 따라 MemorySaver.delete_thread 가 없으므로 직접 삭제
+        """
+        delete_thread = getattr(checkpointer, "delete_thread", None)
+        if delete_thread is not None:
+            delete_thread(thread_id)
+            return
+        checkpointer.storage.pop(thread_id, None)
+        for name in ["writes", "blobs"]:
+            data = getattr(checkpointer, name, {})
+            for key in [key for key in data if key[0] == thread_id]:
+                del data[key]
+
     def _build_graph(self):
         """
         Des:
             그래프 생성함수
+                - routing_mode 별로 프로세스에서 한번만 컴파일
+                - 노드는 인스턴스별 상태를 사용하지 않음 (요청별 상태는 모두 State 에 저장)
+                - 모든 노드는 track_node 로 감싸서 소요시간 기록
         """
-        builder = StateGraph(State)
-        builder.add_node("_node_initialize", self._node_initialize)
-        builder.add_node("_node_decide_personal", self._node_decide_personal)
-        builder.add_node("_node_decide_preference", self._node_decide_preference)
-        builder.add_node("_node_decide_search", self._node_decide_search)
-        builder.add_node("_node_write_memory", self._node_write_memory)
-        builder.add_node("_node_answer", self._node_answer)
-        builder.add_node("_node_optimize_memory", self._node_optimize_memory)
-        builder.add_edge(START, "_node_initialize")
-        builder.add_edge("_node_initialize", "_node_decide_personal")
-        builder.add_edge("_node_initialize", "_node_decide_preference")
-        builder.add_edge("_node_initialize", "_node_decide_search")
-        builder.add_edge(
-            ["_node_decide_personal", "_node_decide_preference", "_node_decide_search"],
-            "_node_write_memory",
-        )
-        builder.add_edge("_node_write_memory", "_node_answer")
-        builder.add_edge("_node_answer", "_node_optimize_memory")
-        builder.add_edge("_node_optimize_memory", END)
-        ShortTermMemory = MemorySaver()
-        LongTermMemory = InMemoryStore()
-        self.graph = builder.compile(checkpointer=ShortTermMemory, store=LongTermMemory)
-        print(f"{GREEN}[agent.py] 그래프 빌드 완료{RESET}")
+        with ChatbotAgent._lock:
+            if self.ROUTING_MODE in ChatbotAgent._graphs:
+                return ChatbotAgent._graphs[self.ROUTING_MODE]
+            builder = StateGraph(State)
+
+            def add_node(name, node):
+                # 노드별 소요시간/LLM 사용량 집계 (utils.metrics)
+                builder.add_node(name, track_node(name, node))
 
-    def _node_initialize(self, state: State, config: RunnableConfig, store: BaseStore):
+            add_node("_node_initialize", self._node_initialize)
+            add_node("_node_write_memory", self._node_write_memory)
+            add_node("_node_answer", self._node_answer)
+            add_node("_node_optimize_memory", self._node_optimize_memory)
+            builder.add_edge(START, "_node_initialize")
+            if self.ROUTING_MODE == "combined":
+                add_node("_node_decide_route", self._node_decide_route)
+                builder.add_edge("_node_initialize", "_node_decide_route")
+                builder.add_edge("_node_decide_route", "_node_write_memory")
+            else:
+                add_node("_node_decide_personal", self._node_decide_personal)
+                add_node("_node_decide_preference", self._node_decide_preference)
+                add_node("_node_decide_search", self._node_decide_search)
+                builder.add_edge("_node_initialize", "_node_decide_personal")
+                builder.add_edge("_node_initialize", "_node_decide_preference")
+                builder.add_edge("_node_initialize", "_node_decide_search")
+                builder.add_edge(
+                    ["_node_decide_personal", "_node_decide_preference", "_node_decide_search"],
+                    "_node_write_memory",
+                )
+            builder.add_edge("_node_write_memory", "_node_answer")
+            if system_config.agent.memory_write == "background":
+                add_node("_node_schedule_memory", self._node_schedule_memory)
+                builder.add_edge("_node_answer", "_node_schedule_memory")
+                builder.add_edge("_node_schedule_memory", "_node_optimize_memory")
+            else:
+                builder.add_edge("_node_answer", "_node_optimize_memory")
+            builder.add_edge("_node_optimize_memory", END)
+            graph = builder.compile(
+                checkpointer=ChatbotAgent._shared["checkpointer"],
+                store=ChatbotAgent._shared["store"],
+            )
+            ChatbotAgent._graphs[self.ROUTING_MODE] = graph
+            logger.info("그래프 빌드 완료 (routing_mode={})", self.ROUTING_MODE)
+            return graph
+
+    async def _node_initialize(self, state: State, config: RunnableConfig, store: BaseStore):
         """
         Des:
             초기화 함수
                 - 메모리 초기화
-                    - 케이스 1) 사용자가 채팅 처음 시작 -> set_config -> DB에 정보없으니까 else로 가서 종료
-                    - 케이스 2) 사용자가 채팅을 '새로운 대화'로 시작함 -> 그래프 새로 빌드 -> 롱텀 초기화 -> set_config -> 사용자 정보가 있으니까 데이터 삽입
+                    - 케이스 1) 사용자가 채팅 처음 시작 -> set_config -> DB에 정보없으니까 빈 값 (스토어에 쓸 필요 없음)
+                    - 케이스 2) 사용자가 채팅을 '새로운 대화'로 시작함 -> thread_id 교체 -> set_config -> 사용자 정보가 있으니까 데이터 삽입
                     - 케이스 3) 사용자가 채팅을 했었는데 내가 서버 다시킴 -> 그래프 새로 빌드 -> 롱텀 초기화 -> set_config -> 사용자 정보가 있으니까 데이터 삽입
-                - 사용자 정보 초기화
+                - 사용자 정보 초기화 (사용자 정보 캐시에서 읽고, 그래프 스토어와 다를 때만 반영)
+                    - 워커끼리 공유하는 스토어(SqliteStore)는 비어 있을 때만 채움 (_seed_memory)
+                - 이전 턴에 등록한 대화 요약이 끝났으면 반영 (요약된 메시지 삭제 + 요약 갱신)
                 - 사용자 요청메시지 취합
         """
         user_id = config["configurable"]["user_id"]
+        summary_update = self._apply_summary(config["configurable"]["thread_id"], state)
+        removed = {m.id for m in summary_update.get("messages", [])}
         namespace = ("memories", user_id)
-        user_info = self.user_data.process_request(user_id)
-        if user_info:
-            print(
-                f"{YELLOW}[agent.py] 데이터베이스에 이전 사용자 정보가 있습니다. 그래프내에 데이터를 삽입합니다.{RESET}"
-            )
-            store.put(
-                namespace=namespace, key="personal_info", value={"memory": user_info[1]}
-            )
-            store.put(
-                namespace=namespace,
-                key="personal_preference",
-                value={"memory": user_info[2]},
-            )
+        if isinstance(store, SqliteStore):
+            missing = [
+                key
+                for key in UserProfileCache.FIELDS
+                if await store.aget(namespace=namespace, key=key) is None
+            ]
+            if missing:
+                await self._locked(f"profile:{user_id}", self._seed_memory(user_id, store))
         else:
-            print(
-                f"{YELLOW}[agent.py] 데이터베이스에 이전 사용자 정보가 없습니다.{RESET}"
-            )
+            profile = await self.profiles.aget(user_id)
+            for key, value in profile.items():
+                # 그래프 스토어에 이미 같은 값이 있으면 다시 쓰지 않음
+                if await self._get_memory(namespace=namespace, key=key, store=store) != value:
+                    await store.aput(namespace=namespace, key=key, value={"memory": value})
 
         # 사용자 요청메시지만 취합해서 정리 (라우팅 등에서 사용)
-        self.previous_human_messages = [
-            i.content for i in state["messages"] if isinstance(i, HumanMessage)
+        previous_human_messages = [
+            i.content
+            for i in state["messages"]
+            if isinstance(i, HumanMessage) and i.id not in removed
         ]
-        self.previous_human_messages_query = ""
-        for idx, message in enumerate(self.previous_human_messages, start=1):
-            if idx != len(self.previous_human_messages):
-                self.previous_human_messages_query += (
-                    f"{idx}번째 요청 메시지 : {message}\n"
-                )
+        previous_human_messages_query = ""
+        for idx, message in enumerate(previous_human_messages, start=1):
+            if idx != len(previous_human_messages):
+                previous_human_messages_query += f"{idx}번째 요청 메시지 : {message}\n"
             else:
-                self.previous_human_messages_query += (
-                    f"[현재 요청 메시지] : {message}\n"
-                )
-        print(
-            f"{RED}요청 메시지 취합한거 메시지 : {self.previous_human_messages_query}{RESET}"
+                previous_human_messages_query += f"[현재 요청 메시지] : {message}\n"
+        logger.opt(lazy=True).debug("요청 메시지 취합 : {}", lambda: clip(previous_human_messages_query))
+        return {"previous_human_messages_query": previous_human_messages_query, **summary_update}
+
+    async def _seed_memory(self, user_id: str, store: BaseStore):
+        """
+        Des:
+            워커끼리 공유하는 스토어에 없는 사용자 정보를 DB 값으로 채우는 함수 (사용자 정보 잠금을 잡고 호출)
+                - 공유 스토어에 있는 값이 최신이므로 DB 값으로 덮어쓰지 않음
+                  (백그라운드 갱신은 스토어 -> DB 순서로 쓰므로, 그 사이에 읽은 DB 값은 이전 값일 수 있음)
+        """
+        namespace = ("memories", user_id)
+        profile = await self.profiles.aget(user_id)
+        for key, value in profile.items():
+            if await store.aget(namespace=namespace, key=key) is None:
+                await store.aput(namespace=namespace, key=key, value={"memory": value})
+
+    async def _node_decide_route(self, state: State):
+        """
+        Des:
+            개인정보/답변 선호도/검색 여부를 한번의 호출(JSON 모드)로 판단하는 노드
+        """
+        prompt = [SystemMessage(content=prompt_config.decide_route_prompt)] + [
+            HumanMessage(content=state["previous_human_messages_query"])
+        ]
+        START_TIME = time.time()
+        response = (
+            await self.llm.ainvoke(
+                prompt,
+                priority=PRIORITY_ROUTING,
+                cache=True,
+                response_format={"type": "json_object"},
+            )
+        ).content
+        try:
+            decision = json.loads(response)
+        except json.JSONDecodeError:
+            logger.warning("라우팅 결과 파싱 실패 : {}", clip(response))
+            decision = {}
+        route = {
+            key: self._yes_or_no(decision.get(key))
+            for key in ["is_personal", "is_preference", "is_search"]
+        }
+        logger.info(
+            "라우팅 결과 : {route} ({seconds:.2f}s)", route=route, seconds=time.time() - START_TIME
         )
+        return route
 
-    def _node_decide_personal(self, state: State):
+    @staticmethod
+    def _yes_or_no(value) -> str:
+        """
+        Des:
+            라우팅 JSON 값을 "YES" / "NO" 로 맞추는 함수
+                - JSON 모드에서 모델이 불리언(true/false)으로 답하는 경우가 있어 함께 허용
+        """
+        if isinstance(value, bool):
+            return "YES" if value else "NO"
+        return "YES" if str(value).strip().upper() in ("YES", "TRUE") else "NO"
+
+    async def _node_decide_personal(self, state: State):
         """
         Des:
             사용자 요청에 개인정보 여부가 있는지 판단하는 노드
         """
         prompt = [SystemMessage(content=prompt_config.decide_personal_prompt)] + [
-            HumanMessage(content=self.previous_human_messages_query)
+            HumanMessage(content=state["previous_human_messages_query"])
         ]
-        return {"is_personal": [self.llm.invoke(prompt)][0].content.upper()}
+        return {
+            "is_personal": (
+                await self.llm.ainvoke(prompt, priority=PRIORITY_ROUTING, cache=True)
+            ).content.upper()
+        }
 
-    def _node_decide_preference(self, state: State):
+    async def _node_decide_preference(self, state: State):
         """
         Des:
             사용자 요청에 답변 선호도 여부가 있는지 판단하는 노드
         """
         prompt = [SystemMessage(content=prompt_config.decide_preference_prompt)] + [
-            HumanMessage(content=self.previous_human_messages_query)
+            HumanMessage(content=state["previous_human_messages_query"])
         ]
-        return {"is_preference": [self.llm.invoke(prompt)][0].content.upper()}
+        return {
+            "is_preference": (
+                await self.llm.ainvoke(prompt, priority=PRIORITY_ROUTING, cache=True)
+            ).content.upper()
+        }
 
-    def _node_decide_search(self, state: State):
+    async def _node_decide_search(self, state: State):
         """
         Des:
             사용자 요청에 검색 여부를 결정하는 노드
         """
         prompt = [SystemMessage(content=prompt_config.decide_search_prompt)] + [
-            HumanMessage(content=self.previous_human_messages_query)
+            HumanMessage(content=state["previous_human_messages_query"])
         ]
-        return {"is_search": [self.llm.invoke(prompt)][0].content.upper()}
+        return {
+            "is_search": (
+                await self.llm.ainvoke(prompt, priority=PRIORITY_ROUTING, cache=True)
+            ).content.upper()
+        }
 
-    def _node_write_memory(
+    async def _node_write_memory(
         self, state: State, config: RunnableConfig, store: BaseStore
     ):
         """
         Des:
             사용자 메시지를 인식하고, 개인정보/선호도/검색결과 등을 저장하는 노드
+                - memory_write == "background" 이면 개인정보/선호도 갱신은 답변 후 _node_schedule_memory 에서 처리
+        """
+        if system_config.agent.memory_write == "inline":
+            await self._rewrite_profile(
+                user_id=config["configurable"]["user_id"],
+                is_personal=state.get("is_personal"),
+                is_preference=state.get("is_preference"),
+                query=state["previous_human_messages_query"],
+                store=store,
+            )
+
+        if state.get("is_search") == "YES":
+            search_keyword, main_context, suffix_context = await self._web_search(state)
+            return {
+                "search_keyword": search_keyword,
+                "main_context": main_context,
+                "suffix_context": suffix_context,
+            }
+
+    async def _node_schedule_memory(
+        self, state: State, config: RunnableConfig, store: BaseStore
+    ):
         """
+        Des:
+            답변 생성 후 개인정보/선호도 갱신을 백그라운드 작업으로 등록하는 노드 (memory_write == "background")
+                - 답변은 현재 저장된 정보 + 이번 요청 메시지로 생성되므로 갱신을 기다리지 않음
+                - 같은 사용자의 갱신 작업은 등록된 순서대로 하나씩 실행
+                - 워커가 여러개면 사용자 정보 잠금을 잡고 실행 (다른 워커의 갱신과 겹치면 변경사항이 유실되므로)
+        """
+        if state.get("is_personal") != "YES" and state.get("is_preference") != "YES":
+            return
         user_id = config["configurable"]["user_id"]
+        previous = ChatbotAgent._memory_tasks.get(user_id)
+        task = asyncio.create_task(
+            self._run_after(
+                previous,
+                self._locked(
+                    f"profile:{user_id}",
+                    self._rewrite_profile(
+                        user_id=user_id,
+                        is_personal=state.get("is_personal"),
+                        is_preference=state.get("is_preference"),
+                        query=state["previous_human_messages_query"],
+                        store=store,
+                    ),
+                ),
+            )
+        )
+        ChatbotAgent._memory_tasks[user_id] = task
+
+        def forget(done):
+            # 뒤에 등록된 작업이 없으면 정리
+            if ChatbotAgent._memory_tasks.get(user_id) is done:
+                del ChatbotAgent._memory_tasks[user_id]
+
+        task.add_done_callback(forget)
+
+    @staticmethod
+    async def _run_after(previous, coro):
+        """
+        Des:
+            이전 작업이 끝난 뒤 coro 를 실행하는 함수 (사용자별 갱신 순서 보장)
+        """
+        if previous is not None:
+            await asyncio.gather(previous, return_exceptions=True)
+        try:
+            await coro
+        except Exception as e:
+            logger.exception("사용자 정보 갱신 중 에러 발생: {}", e)
+
+    @staticmethod
+    async def _locked(key: str, coro):
+        """
+        Des:
+            사용자 정보 잠금(있으면)을 잡고 coro 를 실행하는 함수
+        """
+        lock = ChatbotAgent._shared.get("profile_lock")
+        if lock is None:
+            return await coro
+        async with lock.hold(key):
+            return await coro
+
+    async def _rewrite_profile(
+        self, user_id: str, is_personal: str, is_preference: str, query: str, store: BaseStore
+    ):
+        """
+        Des:
+            사용자 정보/답변 선호도를 LLM 으로 갱신하고 스토어, 사용자 정보 캐시(-> DB)에 반영하는 함수
+        """
         namespace = ("memories", user_id)
-        if state.get("is_personal") == "YES":
-            personal_memory = self._get_memory(
+        if is_personal == "YES":
+            personal_memory = await self._get_memory(
                 namespace=namespace, key="personal_info", store=store
             )
             system_message = prompt_config.create_memory_prompt.format(
                 memory=personal_memory
             )
             memory_prompt = [SystemMessage(content=system_message)] + [
-                HumanMessage(content=self.previous_human_messages_query)
+                HumanMessage(content=query)
             ]
-            result = self.llm.invoke(memory_prompt).content
-            store.put(
+            result = (
+                await self.llm.ainvoke(memory_prompt, priority=PRIORITY_MEMORY)
+            ).content
+            await store.aput(
                 namespace=namespace, key="personal_info", value={"memory": result}
             )
-            self.user_data.update_user_info(user_id, "personal_info", result)
-        if state.get("is_preference") == "YES":
-            preference_memory = self._get_memory(
+            await self.profiles.aupdate(user_id, "personal_info", result)
+        if is_preference == "YES":
+            preference_memory = await self._get_memory(
                 namespace=namespace, key="personal_preference", store=store
             )
             system_message = prompt_config.create_preference_prompt.format(
                 preference=preference_memory
             )
             preference_prompt = [SystemMessage(content=system_message)] + [
-                HumanMessage(content=self.previous_human_messages_query)
+                HumanMessage(content=query)
             ]
-            result = self.llm.invoke(preference_prompt).content
-            store.put(
+            result = (
+                await self.llm.ainvoke(preference_prompt, priority=PRIORITY_MEMORY)
+            ).content
+            await store.aput(
                 namespace=namespace, key="personal_preference", value={"memory": result}
             )
-            self.user_data.update_user_info(user_id, "personal_preference", result)
-
-        if state.get("is_search") == "YES":
-            main_context, suffix_context = self._web_search()
-            store.put(
-                namespace=namespace, key="main_context", value={"memory": main_context}
-            )
-            store.put(
-                namespace=namespace,
-                key="suffix_context",
-                value={"memory": suffix_context},
-            )
+            await self.profiles.aupdate(user_id, "personal_preference", result)
 
-    def _node_answer(self, state: State, config: RunnableConfig, store: BaseStore):
+    async def _node_answer(self, state: State, config: RunnableConfig, store: BaseStore):
         """
         Des:
             사용자 메시지를 인식하고, 답변을 생성하는 노드
+                - 프롬프트 캐시가 잘 맞도록 바뀌지 않는 부분부터 조립
+                    - 시스템 메시지 : 고정 지침 -> 사용자 정보/답변 선호도 -> 이전 대화 요약
+                    - 대화 기록 -> 현재 요청 (검색 참고내용은 매번 바뀌므로 마지막 메시지에만 포함)
         """
         user_id = config["configurable"]["user_id"]
         namespace = ("memories", user_id)
-        personal_memory = self._get_memory(
+        personal_memory = await self._get_memory(
             namespace=namespace, key="personal_info", store=store
         )
-        personal_preference = self._get_memory(
+        personal_preference = await self._get_memory(
             namespace=namespace, key="personal_preference", store=store
         )
-
-        if state.get("is_search") == "YES":
-            main_context = self._get_memory(
-                namespace=namespace, key="main_context", store=store
-            )
-            suffix_context = self._get_memory(
-                namespace=namespace, key="suffix_context", store=store
-            )
-            system_message = prompt_config.answer_prompt.format(
+        system_message = (
+            self.system_prompt
+            + prompt_config.answer_prompt
+            + prompt_config.user_profile.format(
                 memory=personal_memory, preference=personal_preference
             )
+        )
+        if state.get("summary"):
+            system_message += prompt_config.conversation_summary.format(summary=state["summary"])
+
+        if state.get("is_search") == "YES":
+            main_context = state.get("main_context", "")
+            suffix_context = state.get("suffix_context", "")
             user_prompt = prompt_config.answer_with_context.format(
                 context=main_context, query=state["messages"][-1].content
             )  # TODO 향후 고려필요
             prompt = (
-                [SystemMessage(content=self.system_prompt + system_message)]
+                [SystemMessage(content=system_message)]
                 + state["messages"][:-1]
                 + [HumanMessage(content=user_prompt)]
             )  # TODO 향후 고려필요
-            print(f"{BLUE}Answer with Search prompt : {prompt[0].content}{RESET}")
-            response = self.llm.invoke(prompt).content
+            logger.opt(lazy=True).debug("Answer with Search prompt : {}", lambda: clip(prompt[0].content))
+            response = (
+                await self.llm.ainvoke(
+                    prompt, priority=PRIORITY_ANSWER, **self._prompt_cache_kwargs(user_id)
+                )
+            ).content
             return {
                 "messages": AIMessage(
                     content=self._postprocess(response) + "\n" + suffix_context
                 )
             }
         else:
-            system_message = prompt_config.answer_prompt.format(
-                memory=personal_memory, preference=personal_preference
-            )
-            prompt = [
-                SystemMessage(content=self.system_prompt + system_message)
-            ] + state["messages"]
-            print(f"{BLUE}Answer prompt : {prompt[0].content}{RESET}")
-            response = self.llm.invoke(prompt).content
+            prompt = [SystemMessage(content=system_message)] + state["messages"]
+            logger.opt(lazy=True).debug("Answer prompt : {}", lambda: clip(prompt[0].content))
+            response = (
+                await self.llm.ainvoke(
+                    prompt, priority=PRIORITY_ANSWER, **self._prompt_cache_kwargs(user_id)
+                )
+            ).content
             return {"messages": AIMessage(content=self._postprocess(response))}
 
-    def _node_optimize_memory(self, state: State):
+    async def _node_optimize_memory(self, state: State, config: RunnableConfig):
         """
         Des:
             메모리 최적화 함수
+                - summary: 대화 기록이 max_messages 를 넘으면 최근 keep_messages 개만 남기고,
+                           삭제될 메시지를 기존 요약에 합치는 작업을 백그라운드로 등록 (삭제될 때만 요약 호출)
+                    - 답변 전달이 요약 호출(가장 낮은 우선순위)을 기다리지 않음
+                    - 요약 결과는 다음 턴 _node_initialize 에서 반영, thread 당 요약 작업은 하나씩만 실행
+                - truncate: LIMIT_LENGTH 를 넘으면 오래된 절반 삭제
+                - 이번 턴 검색 참고내용은 체크포인트에 남기지 않음
         """
-        if len(state["messages"]) > self.LIMIT_LENGTH:
+        messages = state["messages"]
+        cleared = {"main_context": "", "suffix_context": ""}
+        if system_config.agent.memory_mode == "summary":
+            thread_id = config["configurable"]["thread_id"]
+            if (
+                len(messages) <= system_config.agent.max_messages
+                or thread_id in ChatbotAgent._summary_tasks
+            ):
+                return cleared
+            # 남겨둘 메시지가 사용자 메시지부터 시작하도록 경계 조정
+            start = len(messages) - system_config.agent.keep_messages
+            while start < len(messages) and not isinstance(messages[start], HumanMessage):
+                start += 1
+            ChatbotAgent._summary_tasks[thread_id] = asyncio.create_task(
+                self._summarize_evicted(state.get("summary", ""), messages[:start])
+            )
+            return cleared
+        if len(messages) > self.LIMIT_LENGTH:
             delete_messages = [
-                RemoveMessage(id=m.id)
-                for m in state["messages"][: self.LIMIT_LENGTH // 2]
+                RemoveMessage(id=m.id) for m in messages[: self.LIMIT_LENGTH // 2]
             ]
-            return {"messages": delete_messages}
-        else:
-            return {"messages": state["messages"]}
+            return {"messages": delete_messages, **cleared}
+        return cleared
+
+    async def _summarize_evicted(self, summary: str, evicted: list) -> dict:
+        """
+        Des:
+            삭제될 메시지들을 기존 요약에 합치는 백그라운드 작업
+                - 실패하면 요약 없이 삭제만 하도록 summary 를 None 으로 반환 (기존 truncate 와 같은 동작)
+        Returns:
+            dict: {"ids": 삭제할 메시지 ID, "base": 합친 기존 요약, "summary": 새 요약 또는 None}
+        """
+        try:
+            new_summary = await self._summarize(summary, evicted)
+        except Exception as e:
+            logger.warning("대화 요약 실패, 요약 없이 오래된 메시지만 삭제 : {}", e)
+            new_summary = None
+        return {"ids": [m.id for m in evicted], "base": summary, "summary": new_summary}
+
+    def _apply_summary(self, thread_id: str, state: State) -> dict:
+        """
+        Des:
+            끝난 대화 요약 작업의 결과를 그래프 상태 변경으로 바꾸는 함수 (끝나지 않았으면 다음 턴에 반영)
+                - 요약 이후 다른 워커가 먼저 정리했다면(메시지가 없거나 기존 요약이 다르면) 버림
+        """
+        task = ChatbotAgent._summary_tasks.get(thread_id)
+        if task is None or not task.done():
+            return {}
+        del ChatbotAgent._summary_tasks[thread_id]
+        if task.cancelled():
+            return {}
+        result = task.result()
+        current = {m.id for m in state["messages"]}
+        if not set(result["ids"]) <= current or result["base"] != state.get("summary", ""):
+            return {}
+        update = {"messages": [RemoveMessage(id=message_id) for message_id in result["ids"]]}
+        if result["summary"] is not None:
+            update["summary"] = result["summary"]
+        return update
+
+    @staticmethod
+    def _cancel_summary(thread_id: str):
+        """
+        Des:
+            thread 의 대화 요약 작업을 취소하는 함수 (대화 초기화, 에이전트 제거시)
+        """
+        task = ChatbotAgent._summary_tasks.pop(thread_id, None)
+        if task is not None:
+            task.get_loop().call_soon_threadsafe(task.cancel)
 
-    def _web_search(self):
+    async def _summarize(self, summary: str, messages: list) -> str:
+        """
+        Des:
+            대화 기록에서 삭제되는 메시지들을 기존 요약에 합치는 함수
+        """
+        history = "\n".join(
+            f'{"사용자" if isinstance(m, HumanMessage) else "챗봇"} : {m.content}'
+            for m in messages
+        )
+        prompt = prompt_config.summarize_conversation_prompt.format(
+            summary=summary, messages=history
+        )
+        START_TIME = time.time()
+        result = (await self.llm.ainvoke(prompt, priority=PRIORITY_MEMORY)).content
+        logger.info(
+            "대화 요약 갱신 : 메시지 {count}개 ({seconds:.2f}s)",
+            count=len(messages),
+            seconds=time.time() - START_TIME,
+        )
+        return result
+
+    async def _web_search(self, state: State):
         """
         Des:
             웹 검색 함수
+        Returns:
+            검색어, 참고내용, 출처
         """
         prompt = prompt_config.generate_search_keyword.format(
-            query=self.previous_human_messages_query,
-            previous_search_keyword=self.search_keyword,
+            query=state["previous_human_messages_query"],
+            previous_search_keyword=state.get("search_keyword", ""),
         )
-        self.search_keyword = self.llm.invoke(prompt).content
-        results = google_search_scrape(
-            self.search_keyword, SEARCH_RESULT_COUNT=self.SEARCH_RESULT_COUNT
-        )
-        print(
-            f"{RED}검색어 : {self.search_keyword}\n검색결과 : {len(results)}\n{RESET}"
+        search_keyword = (
+            await self.llm.ainvoke(prompt, priority=PRIORITY_ROUTING, cache=True)
+        ).content
+        with timer(SEARCH_STEP_SECONDS, trace_key="google_search_s", step="google_search"):
+            results = await agoogle_search_scrape(
+                search_keyword, SEARCH_RESULT_COUNT=self.SEARCH_RESULT_COUNT
+            )
+        logger.info(
+            "검색어 : {keyword} | 검색결과 : {count}", keyword=search_keyword, count=len(results)
         )
-        main_context = ""
-        suffix_context = ""
-        for idx, result in enumerate(results):
-            title = result.get('title')
-            link = result.get("link")
-            try:
-                desc, detailed_content = extract_content(link)
-            except:
-                pass
-            try:
-                if (
-                    "Enable JavaScript and cookies" in detailed_content
-                ):  # TODO 동적페이지 처리방식 필요
-                    continue
-            except:
+        with timer(SEARCH_STEP_SECONDS, trace_key="fetch_pages_s", step="fetch_pages"):
+            contents = await afetch_contents([result.get("link") for result in results])
+        pages = []
+        for idx, (result, (desc, detailed_content)) in enumerate(zip(results, contents)):
+            if (
+                not detailed_content
+                or "Enable JavaScript and cookies" in detailed_content
+            ):  # TODO 동적페이지 처리방식 필요
                 continue
-            main_context += f"제목 : {title}\n링크 : {link}\n설명 : {desc}\n내용 : {detailed_content}\n\n"
+            pages.append(
+                {
+                    "idx": idx,
+                    "title": result.get("title"),
+                    "link": result.get("link"),
+                    "desc": desc,
+                    "content": detailed_content,
+                }
+            )
+
+        # 질의와 관련된 문단만 토큰 예산 안에서 선택 (BM25)
+        with timer(SEARCH_STEP_SECONDS, trace_key="rank_passages_s", step="rank_passages"):
+            main_context, used = build_search_context(
+                query=f'{state["messages"][-1].content} {search_keyword}',
+                pages=pages,
+                budget_tokens=system_config.search_context.budget_tokens,
+                chars_per_token=system_config.llm.chars_per_token,
+                passage_chars=system_config.search_context.passage_chars,
+                min_passage_chars=system_config.search_context.min_passage_chars,
+            )
+        suffix_context = ""
+        for page in [pages[i] for i in used]:
             suffix_context += f"""
-📌 참고내용 [{idx+1}]
-제목 : {title}
-링크 : {link}
+📌 참고내용 [{page["idx"]+1}]
+제목 : {page["title"]}
+링크 : {page["link"]}
 """
-        return main_context, suffix_context
+        logger.info(
+            "참고내용 : {pages}개 페이지, {chars}자", pages=len(used), chars=len(main_context)
+        )
+        return search_keyword, main_context, suffix_context
+
+    @staticmethod
+    def _prompt_cache_kwargs(user_id: str) -> dict:
+        """
+        Des:
+            같은 사용자의 답변 호출이 같은 프롬프트 캐시로 가도록 하는 호출 옵션 (사용자 ID 는 해시해서 전달)
+                - openai 패키지 버전에 따라 create() 에 prompt_cache_key 인자가 없으므로 요청 본문(extra_body)에 직접 추가
+        """
+        if not system_config.llm.prompt_cache_key:
+            return {}
+        return {"extra_body": {"prompt_cache_key": hashlib.sha256(user_id.encode()).hexdigest()[:16]}}
 
-    def _get_memory(self, namespace, key, store: BaseStore):
+    async def _get_memory(self, namespace, key, store: BaseStore):
         """
         Des:
             현재 저장된 사용자 정보를 가져오는 함수
         """
-        existing_memory = store.get(namespace=namespace, key=key)
+        existing_memory = await store.aget(namespace=namespace, key=key)
         return existing_memory.value.get("memory") if existing_memory else ""
 
-    def _call_graph(self, messages):
+    async def _call_graph(self, messages):
         """
         Des:
             그래프 호출 함수
         """
-        return self.graph.invoke({"messages": messages}, config=self.config)
+        return await self.graph.ainvoke({"messages": messages}, config=self.config)
 
     def _postprocess(self, result: str):
         """
@@ -0,0 +1,344 @@
+import random
+import asyncio
+import sqlite3
+import threading
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+
+try:
+    from langgraph.checkpoint.base import get_checkpoint_metadata
+except ImportError:  # 구버전 langgraph-checkpoint
+
+    def get_checkpoint_metadata(config: RunnableConfig, metadata: CheckpointMetadata):
+        return metadata
+
+
+class BoundedSqliteSaver(BaseCheckpointSaver):
+    """
+    Des:
+        SQLite 기반 체크포인터
+            - thread 마다 최근 max_checkpoints 개의 체크포인트만 남기고 이전 체크포인트/쓰기 기록은 삭제
+            - 메모리에 대화 기록을 들고 있지 않고, 요청이 오면 해당 thread 만 DB에서 읽음 (재시작 후에도 유지)
+            - 비동기 메서드는 DB 작업을 스레드에서 실행해 이벤트 루프를 막지 않음
+    """
+
+    def __init__(
+        self, db_path: str, max_checkpoints: int = 2, busy_timeout: int = 5000, serde=None
+    ):
+        super().__init__(serde=serde)
+        self.db_path = db_path
+        self.max_checkpoints = max(1, max_checkpoints)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        # 여러 워커 프로세스가 같은 파일에 쓸 때 잠금을 기다림
+        self.conn.execute(f"PRAGMA busy_timeout={busy_timeout}")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                parent_checkpoint_id TEXT,
+                type TEXT,
+                checkpoint BLOB,
+                metadata_type TEXT,
+                metadata BLOB,
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id)
+            )
+        """
+        )
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS writes (
+                thread_id TEXT NOT NULL,
+                checkpoint_ns TEXT NOT NULL DEFAULT '',
+                checkpoint_id TEXT NOT NULL,
+                task_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                channel TEXT NOT NULL,
+                type TEXT,
+                value BLOB,
+                PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+            )
+        """
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        with self.lock:
+            if checkpoint_id := get_checkpoint_id(config):
+                row = self.conn.execute(
+                    """
+                    SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata
+                    FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?
+                    """,
+                    (thread_id, checkpoint_ns, checkpoint_id),
+                ).fetchone()
+            else:
+                row = self.conn.execute(
+                    """
+                    SELECT checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata
+                    FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?
+                    ORDER BY checkpoint_id DESC LIMIT 1
+                    """,
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None:
+                return None
+            return self._to_tuple(thread_id, checkpoint_ns, row)
+
+    def list(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        query = """
+            SELECT thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata
+            FROM checkpoints
+        """
+        conditions, params = [], []
+        if config is not None:
+            conditions.append("thread_id = ?")
+            params.append(config["configurable"]["thread_id"])
+            if (checkpoint_ns := config["configurable"].get("checkpoint_ns")) is not None:
+                conditions.append("checkpoint_ns = ?")
+                params.append(checkpoint_ns)
+            if checkpoint_id := get_checkpoint_id(config):
+                conditions.append("checkpoint_id = ?")
+                params.append(checkpoint_id)
+        if before is not None and (before_id := get_checkpoint_id(before)):
+            conditions.append("checkpoint_id < ?")
+            params.append(before_id)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY checkpoint_id DESC"
+
+        count = 0
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+            tuples = []
+            for thread_id, checkpoint_ns, *row in rows:
+                checkpoint_tuple = self._to_tuple(thread_id, checkpoint_ns, row)
+                if filter and not all(
+                    checkpoint_tuple.metadata.get(k) == v for k, v in filter.items()
+                ):
+                    continue
+                tuples.append(checkpoint_tuple)
+                count += 1
+                if limit is not None and count >= limit:
+                    break
+        yield from tuples
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        type_, serialized_checkpoint = self.serde.dumps_typed(checkpoint)
+        metadata_type, serialized_metadata = self.serde.dumps_typed(
+            get_checkpoint_metadata(config, metadata)
+        )
+        with self.lock:
+            # 쓰기 잠금을 먼저 잡아서 다른 프로세스와 읽기->쓰기 잠금 승격 충돌이 나지 않도록 함
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self.conn.execute(
+                    """
+                    INSERT OR REPLACE INTO checkpoints
+                    (thread_id, checkpoint_ns, checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        thread_id,
+                        checkpoint_ns,
+                        checkpoint["id"],
+                        config["configurable"].get("checkpoint_id"),
+                        type_,
+                        serialized_checkpoint,
+                        metadata_type,
+                        serialized_metadata,
+                    ),
+                )
+                self._compact(thread_id, checkpoint_ns)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        # 특수 채널(에러, 인터럽트 등)은 덮어쓰고, 일반 쓰기는 이미 있으면 유지 (InMemorySaver 와 동일)
+        rows = {"INSERT OR REPLACE": [], "INSERT OR IGNORE": []}
+        for idx, (channel, value) in enumerate(writes):
+            type_, serialized_value = self.serde.dumps_typed(value)
+            statement = "INSERT OR REPLACE" if channel in WRITES_IDX_MAP else "INSERT OR IGNORE"
+            rows[statement].append(
+                (
+                    thread_id,
+                    checkpoint_ns,
+                    checkpoint_id,
+                    task_id,
+                    WRITES_IDX_MAP.get(channel, idx),
+                    channel,
+                    type_,
+                    serialized_value,
+                )
+            )
+        with self.lock:
+            for statement, params in rows.items():
+                if params:
+                    self.conn.executemany(
+                        f"""
+                        {statement} INTO writes
+                        (thread_id, checkpoint_ns, checkpoint_id, task_id, idx, channel, type, value)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        params,
+                    )
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self.lock:
+            self.conn.execute("DELETE FROM checkpoints WHERE thread_id = ?", (thread_id,))
+            self.conn.execute("DELETE FROM writes WHERE thread_id = ?", (thread_id,))
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        tuples = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint_tuple in tuples:
+            yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
+
+    def get_next_version(self, current: Optional[str], channel: None) -> str:
+        if current is None:
+            current_v = 0
+        elif isinstance(current, int):
+            current_v = current
+        else:
+            current_v = int(current.split(".")[0])
+        return f"{current_v + 1:032}.{random.random():016}"
+
+    def _compact(self, thread_id: str, checkpoint_ns: str):
+        """
+        Des:
+            최근 max_checkpoints 개를 제외한 이전 체크포인트와 쓰기 기록을 삭제하는 함수
+        """
+        stale = self.conn.execute(
+            """
+            SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?
+            ORDER BY checkpoint_id DESC LIMIT -1 OFFSET ?
+            """,
+            (thread_id, checkpoint_ns, self.max_checkpoints),
+        ).fetchall()
+        if not stale:
+            return
+        params = [(thread_id, checkpoint_ns, checkpoint_id) for (checkpoint_id,) in stale]
+        self.conn.executemany(
+            "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            params,
+        )
+        self.conn.executemany(
+            "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+            params,
+        )
+
+    def _to_tuple(self, thread_id: str, checkpoint_ns: str, row) -> CheckpointTuple:
+        checkpoint_id, parent_checkpoint_id, type_, checkpoint, metadata_type, metadata = row
+        writes = self.conn.execute(
+            """
+            SELECT task_id, channel, type, value FROM writes
+            WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?
+            ORDER BY task_id, idx
+            """,
+            (thread_id, checkpoint_ns, checkpoint_id),
+        ).fetchall()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=self.serde.loads_typed((type_, checkpoint)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_checkpoint_id,
+                    }
+                }
+                if parent_checkpoint_id
+                else None
+            ),
+            pending_writes=[
+                (task_id, channel, self.serde.loads_typed((value_type, value)))
+                for task_id, channel, value_type, value in writes
+            ],
+        )
@@ -1,9 +1,29 @@
+import os
+import asyncio
+import sqlite3
+import atexit
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from importlib.resources import files
 from . import *
 
 
 class UserData:
+    """
+    Des:
+        사용자 정보 DB
+            - 스레드별로 커넥션을 열어두고 계속 재사용 (pool_size 개의 DB 작업 스레드)
+            - WAL 모드라서 쓰기 중에도 읽기가 막히지 않음
+            - 비동기 API(aprocess_request, aupdate_user_info)는 DB 작업 스레드에서 실행되어 이벤트 루프를 막지 않음
+    """
+
     def __init__(self):
         self.db_path = os.path.join(files("data"), "user_data.db")
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(
+            max_workers=system_config.db.pool_size, thread_name_prefix="user-data"
+        )
         self._initialize_db()
 
     def process_request(self, user_id: str):
@@ -18,6 +38,14 @@ class UserData:
         user_info = self._get_or_create_user(user_id)
         return user_info
 
+    async def aprocess_request(self, user_id: str):
+        """
+        Des:
+            사용자 정보를 찾거나 생성하는 함수 (비동기)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.process_request, user_id)
+
     def update_user_info(self, user_id: str, field: str, value: str):
         """
         Des:
@@ -28,22 +56,98 @@ class UserData:
             value: 업데이트할 값
         """
         if field not in ["personal_info", "personal_preference"]:
-            print(f"{YELLOW}[db.py] 잘못된 필드 이름: {field}{RESET}")
+            logger.warning("잘못된 필드 이름: {}", field)
             return
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(f"UPDATE users SET {field} = ? WHERE id = ?", (value, user_id))
-        conn.commit()
-        conn.close()
-        print(
-            f"{YELLOW}[db.py] {field} 정보 업데이트 완료. 사용자 id : {user_id}{RESET}"
+        values = {"personal_info": "", "personal_preference": ""}
+        values[field] = value
+        self._connect().execute(
+            f"""
+            INSERT INTO users (id, personal_info, personal_preference) VALUES (?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET {field} = excluded.{field}
+            """,
+            (user_id, values["personal_info"], values["personal_preference"]),
+        )
+        logger.debug("{} 정보 업데이트 완료. 사용자 id : {}", field, user_id)
+
+    async def aupdate_user_info(self, user_id: str, field: str, value: str):
+        """
+        Des:
+            사용자 데이터 업데이트 함수 (비동기)
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self._executor, self.update_user_info, user_id, field, value
         )
 
+    def update_profiles(self, profiles: list[tuple[str, str, str]]):
+        """
+        Des:
+            여러 사용자 정보를 한번의 트랜잭션으로 저장하는 함수
+        Args:
+            profiles: (사용자 ID, personal_info, personal_preference) 리스트
+        """
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                """
+                INSERT INTO users (id, personal_info, personal_preference) VALUES (?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    personal_info = excluded.personal_info,
+                    personal_preference = excluded.personal_preference
+                """,
+                profiles,
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def update_fields(self, updates: list[tuple[str, str, str]]):
+        """
+        Des:
+            여러 사용자의 필드 하나씩을 한번의 트랜잭션으로 저장하는 함수 (나머지 필드는 유지)
+        Args:
+            updates: (사용자 ID, 필드 이름, 값) 리스트
+        """
+        conn = self._connect()
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                """
+                INSERT INTO users (id, personal_info, personal_preference) VALUES (?, '', '')
+                ON CONFLICT(id) DO NOTHING
+                """,
+                [(user_id,) for user_id in {user_id for user_id, _, _ in updates}],
+            )
+            for field in ["personal_info", "personal_preference"]:
+                conn.executemany(
+                    f"UPDATE users SET {field} = ? WHERE id = ?",
+                    [(value, user_id) for user_id, name, value in updates if name == field],
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Des:
+            현재 스레드의 커넥션을 반환하는 함수 (없으면 생성)
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, isolation_level=None)
+            conn.execute(f"PRAGMA busy_timeout={int(system_config.db.busy_timeout)}")
+            conn.execute(f"PRAGMA synchronous={system_config.db.synchronous}")
+            self._local.conn = conn
+        return conn
+
     def _initialize_db(self):
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
             """
             CREATE TABLE IF NOT EXISTS users (
                 id TEXT PRIMARY KEY,
@@ -52,8 +156,6 @@ class UserData:
             )
         """
         )
-        conn.commit()
-        conn.close()
 
     def _get_or_create_user(self, user_id: str):
         """
@@ -64,22 +166,194 @@ class UserData:
         Returns:
             user: 사용자 정보
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-        user_info = cursor.fetchone()
+        conn = self._connect()
+        user_info = conn.execute(
+            "SELECT * FROM users WHERE id = ?", (user_id,)
+        ).fetchone()
         if user_info:
-            conn.close()
-            print(
-                f"{YELLOW}[db.py] 기존 사용자 데이터를 찾았습니다: {user_info}{RESET}"
-            )
+            logger.opt(lazy=True).debug("기존 사용자 데이터를 찾았습니다: {}", lambda: clip(user_info))
             return user_info
         else:
-            cursor.execute(
-                "INSERT INTO users (id, personal_info, personal_preference) VALUES (?, ?, ?)",
-                (user_id, "", ""),
+            # 동시에 같은 사용자가 생성되어도 충돌하지 않도록 ON CONFLICT 사용
+            conn.execute(
+                """
+                INSERT INTO users (id, personal_info, personal_preference) VALUES (?, '', '')
+                ON CONFLICT(id) DO NOTHING
+                """,
+                (user_id,),
             )
-            conn.commit()
-            conn.close()
-            print(f"{YELLOW}[db.py] 새 사용자를 추가했습니다: {user_id}{RESET}")
+            logger.info("새 사용자를 추가했습니다: {}", user_id)
             return None
+
+
+class UserProfileCache:
+    """
+    Des:
+        사용자 정보 캐시 (read-through + write-behind)
+            - 읽기: 메모리에 있으면 DB를 거치지 않고 반환, 없으면 DB에서 읽어서 보관
+            - 쓰기: 메모리만 바꾸고 변경된 사용자로 표시 -> flush_interval 마다 또는 종료시 한번에 DB 반영
+                - 메모리에 없는 사용자는 DB를 읽지 않고 바뀐 필드만 기록해 두었다가 그 필드만 반영
+            - 답변 경로에서는 디스크 I/O를 기다리지 않음
+            - write_through=True (워커 여러개): 다른 워커의 변경을 놓치지 않도록 매번 DB에서 읽고 바로 씀
+    """
+
+    FIELDS = ["personal_info", "personal_preference"]
+
+    def __init__(
+        self,
+        user_data: UserData,
+        max_entries: int,
+        flush_interval: float,
+        write_through: bool = False,
+    ):
+        self.user_data = user_data
+        self.max_entries = max_entries
+        self.flush_interval = flush_interval
+        self.write_through = write_through
+        self._profiles = OrderedDict()  # user_id -> {"personal_info": ..., "personal_preference": ...}
+        self._dirty = set()
+        self._partial = {}  # user_id -> {필드: 값}, 메모리에 없는 사용자의 변경사항
+        self._writing = set()  # DB에 쓰는 중인 사용자 (쓰기가 끝날 때까지 메모리에서 제거하지 않음)
+        self._writing_partial = {}  # DB에 쓰는 중인 _partial (쓰는 동안에도 aget 에서 보이도록 유지)
+        self._epoch = 0  # DB 반영이 끝날 때마다 증가
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._flush_loop, name="profile-flush", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    async def aget(self, user_id: str) -> dict:
+        """
+        Des:
+            사용자 정보 조회 함수 (없는 사용자는 DB에 생성)
+        Returns:
+            dict: {"personal_info": ..., "personal_preference": ...}
+        """
+        while True:
+            with self._lock:
+                profile = self._profiles.get(user_id)
+                if profile is not None:
+                    self._profiles.move_to_end(user_id)
+                    return dict(profile)
+                epoch = self._epoch
+            user_info = await self.user_data.aprocess_request(user_id)
+            loaded = {
+                "personal_info": (user_info[1] or "") if user_info else "",
+                "personal_preference": (user_info[2] or "") if user_info else "",
+            }
+            if self.write_through:
+                return loaded
+            with self._lock:
+                if epoch != self._epoch and user_id not in self._profiles:
+                    # 읽는 사이 DB 반영이 끝났으면 읽은 값이 반영 이전 값일 수 있으므로 다시 읽음
+                    continue
+                # DB를 읽는 사이 다른 요청이 먼저 넣었다면 그 값을 유지
+                profile = self._profiles.setdefault(user_id, loaded)
+                partial = {
+                    **self._writing_partial.get(user_id, {}),
+                    **self._partial.pop(user_id, {}),
+                }
+                if partial:
+                    profile.update(partial)
+                    self._dirty.add(user_id)
+                self._profiles.move_to_end(user_id)
+                self._evict()
+                return dict(profile)
+
+    async def aupdate(self, user_id: str, field: str, value: str):
+        """
+        Des:
+            사용자 정보 변경 함수 (DB 반영은 나중에 모아서 수행)
+        """
+        if field not in self.FIELDS:
+            logger.warning("잘못된 필드 이름: {}", field)
+            return
+        if self.write_through:
+            await self.user_data.aupdate_user_info(user_id, field, value)
+            return
+        with self._lock:
+            profile = self._profiles.get(user_id)
+            if profile is None:
+                self._partial.setdefault(user_id, {})[field] = value
+                return
+            profile[field] = value
+            self._dirty.add(user_id)
+
+    def flush(self):
+        """
+        Des:
+            변경된 사용자 정보를 DB에 한번에 반영하는 함수
+                - 쓰는 동안에도 쓰는 중인 값은 메모리에서 보이고 제거되지 않음 (반영 이전 DB 값이 캐시되지 않도록)
+                - 실패하면 다시 반영 대기 상태로 되돌림
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._dirty and not self._partial:
+                    return
+                partial, self._partial = self._partial, {}
+                self._writing_partial = partial
+                self._writing = set(self._dirty)
+                self._dirty.clear()  # 쓰는 중에 다시 바뀌면 다음 반영 대상이 됨
+                updates = [
+                    (user_id, field, value)
+                    for user_id, fields in partial.items()
+                    for field, value in fields.items()
+                ]
+                profiles = [
+                    (
+                        user_id,
+                        self._profiles[user_id]["personal_info"],
+                        self._profiles[user_id]["personal_preference"],
+                    )
+                    for user_id in self._writing
+                ]
+            try:
+                if profiles:
+                    self.user_data.update_profiles(profiles)
+                if updates:
+                    self.user_data.update_fields(updates)
+                logger.debug("사용자 정보 {}건 DB 반영 완료", len(profiles) + len(partial))
+            except Exception as e:
+                logger.error("사용자 정보 DB 반영 실패: {}", e)
+                with self._lock:
+                    self._dirty.update(self._writing)
+                    for user_id, fields in partial.items():
+                        if user_id in self._profiles:
+                            # 쓰는 사이 메모리에 올라왔다면 이미 반영되어 있으므로 프로필 전체를 다시 씀
+                            self._dirty.add(user_id)
+                            continue
+                        # 그 사이 새로 바뀐 값이 있으면 새 값을 유지
+                        self._partial[user_id] = {**fields, **self._partial.get(user_id, {})}
+            else:
+                with self._lock:
+                    self._epoch += 1
+            finally:
+                with self._lock:
+                    self._writing = set()
+                    self._writing_partial = {}
+
+    def close(self):
+        """
+        Des:
+            주기적 반영을 멈추고 남은 변경사항을 DB에 반영하는 함수
+        """
+        self._stop.set()
+        self.flush()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("사용자 정보 주기적 반영 중 오류")
+
+    def _evict(self):
+        # 오래 사용하지 않은 사용자부터 제거하되, DB 반영 대기중/반영중인 사용자는 남겨둠
+        for user_id in list(self._profiles):
+            if len(self._profiles) <= self.max_entries:
+                break
+            if user_id not in self._dirty and user_id not in self._writing:
+                del self._profiles[user_id]
@@ -0,0 +1,164 @@
+import time
+import random
+import asyncio
+import httpx
+from collections import deque
+from . import *
+from utils.logger import log_ids
+
+
+class _Delivery:
+    """전송 대기열에 들어가는 콜백 1건"""
+
+    def __init__(self, url: str, payload: dict, deadline: float):
+        self.url = url
+        self.payload = payload
+        self.deadline = deadline
+        self.submitted_at = time.time()
+        self.attempts = 0
+        self.log_ids = log_ids.get()  # 요청한 사용자/요청 ID (작업자 로그에 붙임)
+
+
+class CallbackDispatcher:
+    """
+    Des:
+        콜백 전송 대기열
+            - 공용 HTTP 클라이언트 하나로 concurrency 개의 작업자가 전송 (동시 전송 수 제한)
+            - 실패시 지수 백오프 + 지터로 재시도, 콜백 유효시간(deadline)이 지나면 포기
+            - 전송 지연시간, 재시도, 포기 건수 집계
+    """
+
+    def __init__(
+        self,
+        concurrency: int,
+        queue_size: int,
+        max_connections: int,
+        timeout: float,
+        backoff_base: float,
+        backoff_max: float,
+    ):
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.client = None
+        self.delivered = 0
+        self.retries = 0
+        self.dropped = 0
+        self._latencies = deque(maxlen=1000)  # 최근 전송 지연시간 (초)
+        self._queue = None
+        self._workers = []
+
+    async def start(self):
+        """
+        Des:
+            공용 HTTP 클라이언트와 작업자 시작 함수
+        """
+        self.client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self, drain_timeout: float = 10):
+        """
+        Des:
+            남은 콜백을 drain_timeout 동안 전송하고 종료하는 함수
+        """
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=drain_timeout)
+        except asyncio.TimeoutError:
+            logger.error("전송하지 못한 콜백 {}건", self._queue.qsize())
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        await self.client.aclose()
+
+    def submit(self, url: str, payload: dict, deadline: float):
+        """
+        Des:
+            콜백 전송 요청 함수 (대기열에 넣고 바로 반환)
+        Args:
+            url: 콜백 URL
+            payload: 전송할 JSON
+            deadline: 이 시각(time.time())이 지나면 재시도하지 않음
+        """
+        try:
+            self._queue.put_nowait(_Delivery(url, payload, deadline))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.error("전송 대기열이 가득 차서 콜백을 버립니다: {}", url)
+
+    def stats(self) -> dict:
+        """
+        Des:
+            전송 지연시간/재시도/포기 건수 반환 함수
+        """
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] if latencies else 0.0
+
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "delivered": self.delivered,
+            "retries": self.retries,
+            "dropped": self.dropped,
+            "latency_p50": percentile(0.5),
+            "latency_p95": percentile(0.95),
+            "latency_max": latencies[-1] if latencies else 0.0,
+        }
+
+    async def _worker(self):
+        while True:
+            delivery = await self._queue.get()
+            try:
+                with log_context(**delivery.log_ids):
+                    await self._deliver(delivery)
+            except Exception as e:
+                self.dropped += 1
+                logger.exception("콜백 전송 중 에러 발생: {}", e)
+            finally:
+                self._queue.task_done()
+
+    async def _deliver(self, delivery: _Delivery):
+        while True:
+            delivery.attempts += 1
+            error = None
+            try:
+                response = await self.client.post(delivery.url, json=delivery.payload)
+                if response.status_code < 400:
+                    self.delivered += 1
+                    self._latencies.append(time.time() - delivery.submitted_at)
+                    return
+                error = f"HTTP {response.status_code}"
+                # 429, 5xx 외의 4xx 는 다시 보내도 결과가 같으므로 재시도하지 않음
+                if response.status_code != 429 and response.status_code < 500:
+                    break
+            except httpx.HTTPError as e:
+                error = repr(e)
+
+            # 지수 백오프 + full jitter
+            delay = random.uniform(
+                0, min(self.backoff_max, self.backoff_base * 2 ** (delivery.attempts - 1))
+            )
+            if time.time() + delay >= delivery.deadline:
+                break
+            self.retries += 1
+            logger.warning(
+                "콜백 전송 실패({}), {:.2f}초 후 재시도 ({}회차)", error, delay, delivery.attempts
+            )
+            await asyncio.sleep(delay)
+
+        self.dropped += 1
+        logger.error(
+            "콜백 전송 포기 ({}회 시도, 마지막 에러: {}): {}", delivery.attempts, error, delivery.url
+        )
@@ -0,0 +1,120 @@
+import asyncio
+from typing import Awaitable, Callable
+from . import *
+
+
+class InboxMessage:
+    """사용자 inbox 에 쌓이는 메시지 1건"""
+
+    def __init__(self, question: str, callback_url: str, received_at: float):
+        self.question = question
+        self.callback_url = callback_url
+        self.received_at = received_at
+
+
+class UserInbox:
+    """
+    Des:
+        사용자별 요청 대기열
+            - 사용자당 한번에 하나의 그래프 실행만 진행 (config/체크포인트 경쟁 방지)
+            - 실행 중에 들어온 메시지는 다음 실행에서 하나로 합쳐서 처리 (최대 max_merge 건)
+            - 명령어(대화 초기화, 사용법 등)는 합치지 않고 도착 순서대로 단독 처리
+            - lock 이 있으면 실행마다 사용자 잠금을 잡음 (워커 프로세스가 여러개일 때 워커 간 순서 보장)
+    """
+
+    def __init__(
+        self,
+        process: Callable[[object, list[InboxMessage]], Awaitable[None]],
+        is_command: Callable[[str], bool],
+        max_merge: int,
+        lock=None,
+    ):
+        """
+        Args:
+            process: (agent, 메시지 리스트) 를 받아 처리하는 코루틴 함수
+            is_command: 합치면 안 되는 메시지인지 판단하는 함수
+            max_merge: 한번에 합치는 최대 메시지 수
+            lock: 사용자 ID 로 잠금을 잡는 async context manager 를 반환하는 함수 (SqliteLeaseLock.hold)
+        """
+        self.process = process
+        self.is_command = is_command
+        self.max_merge = max_merge
+        self.lock = lock
+        self.runs = 0
+        self.merged = 0
+        self._pending = {}  # user_id -> list[InboxMessage]
+        self._agents = {}  # user_id -> 가장 최근 요청의 에이전트
+        self._workers = {}  # user_id -> asyncio.Task
+
+    def submit(self, user_id: str, agent, message: InboxMessage):
+        """
+        Des:
+            사용자 메시지를 inbox 에 넣는 함수
+                - 처리중인 실행이 없으면 바로 시작, 있으면 끝난 뒤 이어서 처리
+        """
+        self._pending.setdefault(user_id, []).append(message)
+        self._agents[user_id] = agent
+        if user_id not in self._workers:
+            self._workers[user_id] = asyncio.create_task(self._drain(user_id))
+
+    def is_busy(self, user_id: str) -> bool:
+        """
+        Des:
+            사용자의 실행이 진행중이거나 대기중인 메시지가 있는지 확인하는 함수
+        """
+        return user_id in self._workers or bool(self._pending.get(user_id))
+
+    def stats(self) -> dict:
+        """
+        Des:
+            실행 수/합쳐진 메시지 수 반환 함수
+        """
+        return {
+            "active_users": len(self._workers),
+            "pending_messages": sum(len(messages) for messages in self._pending.values()),
+            "runs": self.runs,
+            "merged_messages": self.merged,
+        }
+
+    async def join(self):
+        """
+        Des:
+            처리중인 모든 실행이 끝날 때까지 기다리는 함수 (서버 종료시)
+        """
+        while self._workers:
+            await asyncio.gather(*list(self._workers.values()), return_exceptions=True)
+
+    async def _drain(self, user_id: str):
+        try:
+            while self._pending.get(user_id):
+                batch = self._take_batch(user_id)
+                self.runs += 1
+                self.merged += len(batch) - 1
+                try:
+                    if self.lock is None:
+                        await self.process(self._agents[user_id], batch)
+                    else:
+                        async with self.lock(user_id):
+                            await self.process(self._agents[user_id], batch)
+                except Exception as e:
+                    with log_context(user_id=user_id):
+                        logger.exception("요청 처리 중 에러 발생: {}", e)
+        finally:
+            self._pending.pop(user_id, None)
+            self._agents.pop(user_id, None)
+            self._workers.pop(user_id, None)
+
+    def _take_batch(self, user_id: str) -> list[InboxMessage]:
+        pending = self._pending[user_id]
+        if self.is_command(pending[0].question):
+            count = 1
+        else:
+            count = 0
+            while (
+                count < len(pending)
+                and count < self.max_merge
+                and not self.is_command(pending[count].question)
+            ):
+                count += 1
+        batch, self._pending[user_id] = pending[:count], pending[count:]
+        return batch
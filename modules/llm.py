@@ -0,0 +1,326 @@
+import json
+import time
+import hashlib
+import heapq
+import random
+import asyncio
+import itertools
+import warnings
+from . import *
+from utils.cache import get_cache
+from utils.metrics import (
+    current_node,
+    record,
+    LLM_SECONDS,
+    LLM_QUEUE_SECONDS,
+    LLM_TOKENS,
+    LLM_COST,
+    LLM_CALLS,
+)
+
+# 노드별 우선순위 (작을수록 먼저 처리)
+PRIORITY_ANSWER = 0  # 답변 생성 (사용자가 기다리는 호출)
+PRIORITY_ROUTING = 1  # 라우팅 판단, 검색어 생성
+PRIORITY_MEMORY = 2  # 사용자 정보/답변 선호도 갱신
+
+
+def retryable_errors() -> tuple:
+    """재시도할 openai 예외 (openai 는 import 가 느려서 LLM 클라이언트를 만들 때 불러옴)"""
+    import openai
+
+    return (
+        openai.RateLimitError,
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.InternalServerError,
+    )
+
+
+# response_format 사용시 응답 헤더를 못 가져온다는 경고 (해당 호출은 헤더 없이 처리)
+warnings.filterwarnings("ignore", message="Cannot currently include response headers")
+
+
+class _TokenBucket:
+    """분당 한도(capacity)를 초당 capacity/60 씩 채우는 토큰 버킷"""
+
+    def __init__(self, capacity: float):
+        self.capacity = capacity
+        self.level = capacity
+        self.updated_at = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(
+            self.capacity, self.level + (now - self.updated_at) * self.capacity / 60
+        )
+        self.updated_at = now
+
+    def clamp(self, amount: float) -> float:
+        # 한도보다 큰 요청은 한도만큼만 차감 -> 버킷이 가득 찼을 때 통과 (영원히 대기하지 않도록)
+        return min(amount, self.capacity)
+
+    def wait_time(self, amount: float) -> float:
+        amount = self.clamp(amount)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) * 60 / self.capacity
+
+
+class LLMGateway:
+    """
+    Des:
+        모든 노드가 거쳐가는 프로세스 공용 LLM 호출 창구
+            - 동시 호출 수 제한 (max_concurrency)
+            - 분당 요청 수(RPM) / 분당 토큰 수(TPM) 토큰 버킷으로 계정 한도 안에서 호출
+            - 대기중인 호출은 우선순위 순서로 처리 (답변 > 라우팅 > 메모리)
+            - 429 / Retry-After 를 받으면 모든 호출을 잠시 멈추고 지수 백오프로 재시도
+            - 응답 헤더(x-ratelimit-remaining-*)가 있으면 버킷 잔량을 실제 잔량에 맞춤
+            - 호출별 대기시간/소요시간/토큰(캐시된 입력 토큰 포함)/예상 비용을 노드 이름별로 집계 (utils.metrics)
+            - cache=True 로 호출하면 모델 + 정규화한 프롬프트 기준으로 응답 캐시 (utils.cache "llm")
+    """
+
+    def __init__(
+        self,
+        llm: "ChatOpenAI",
+        max_concurrency: int,
+        rpm: int,
+        tpm: int,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+        chars_per_token: float,
+        output_tokens: int,
+        prices: dict,
+    ):
+        """
+        Args:
+            prices: 100만 토큰당 가격 (USD) {"input", "cached_input", "output"}
+        """
+        self.llm = llm
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.chars_per_token = chars_per_token
+        self.output_tokens = output_tokens
+        self.prices = prices
+        self.calls = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0  # 프로바이더 프롬프트 캐시로 처리된 입력 토큰
+        self._requests = _TokenBucket(rpm)
+        self._tokens = _TokenBucket(tpm)
+        self._active = 0
+        self._paused_until = 0.0
+        self._waiters = []  # (priority, seq, future, tokens)
+        self._seq = itertools.count()
+        self._wakeup = None  # 대기열 재확인 예약 (TimerHandle)
+        self._cache = get_cache("llm")
+        self._retryable = retryable_errors()
+
+    async def ainvoke(
+        self, prompt, priority: int = PRIORITY_MEMORY, cache: bool = False, **kwargs
+    ):
+        """
+        Des:
+            LLM 호출 함수 (ChatOpenAI.ainvoke 와 같은 사용법)
+        Args:
+            prompt: 프롬프트 (문자열 또는 메시지 리스트)
+            priority: 우선순위 (PRIORITY_ANSWER / PRIORITY_ROUTING / PRIORITY_MEMORY)
+            cache: 같은 프롬프트면 같은 답을 써도 되는 호출(분류, 검색어 생성)인지 여부
+            kwargs: ChatOpenAI.ainvoke 에 그대로 전달 (response_format 등)
+        Returns:
+            AIMessage
+        """
+        node = current_node.get()
+        if cache:
+            key = self._cache_key(prompt, kwargs)
+            cached = await self._cache.aget(key)
+            if cached is not None:
+                LLM_CALLS.inc(node=node, status="cache_hit")
+                return AIMessage(content=cached)
+            response = await self.ainvoke(prompt, priority=priority, **kwargs)
+            self._cache.set(key, response.content)
+            return response
+        estimated = self._estimate_tokens(prompt)
+        for attempt in range(self.max_retries + 1):
+            START_TIME = time.perf_counter()
+            await self._acquire(priority, estimated)
+            LLM_QUEUE_SECONDS.observe(time.perf_counter() - START_TIME, node=node)
+            START_TIME = time.perf_counter()
+            try:
+                self.calls += 1
+                response = await self.llm.ainvoke(prompt, **kwargs)
+            except self._retryable as e:
+                LLM_CALLS.inc(node=node, status=type(e).__name__)
+                if attempt == self.max_retries:
+                    raise
+                self.retries += 1
+                delay = self._backoff(e, attempt)
+                logger.warning(
+                    "LLM 호출 실패({}), {:.2f}초 후 재시도 ({}회차)", type(e).__name__, delay, attempt + 1
+                )
+                await asyncio.sleep(delay)
+                continue
+            finally:
+                self._release()
+            elapsed = time.perf_counter() - START_TIME
+            LLM_SECONDS.observe(elapsed, node=node)
+            LLM_CALLS.inc(node=node, status="ok")
+            record("llm_s", elapsed)
+            self._settle(self._tokens.clamp(estimated), response)
+            self._account(node, response, elapsed)
+            return response
+
+    def stats(self) -> dict:
+        """
+        Des:
+            호출 수/재시도/429 횟수 및 버킷 잔량 반환 함수
+        """
+        now = time.monotonic()
+        self._requests.refill(now)
+        self._tokens.refill(now)
+        return {
+            "calls": self.calls,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "prompt_cache_hit_rate": self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0,
+            "in_flight": self._active,
+            "waiting": len(self._waiters),
+            "paused_for": max(0.0, self._paused_until - now),
+            "requests_available": int(self._requests.level),
+            "tokens_available": int(self._tokens.level),
+        }
+
+    async def _acquire(self, priority: int, tokens: int):
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._seq), future, tokens)
+        heapq.heappush(self._waiters, entry)
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release()  # 허가를 받은 직후 취소됨
+            else:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+
+    def _release(self):
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """대기열 맨 앞 호출부터 동시 호출 수/버킷/일시정지 조건을 만족하는 만큼 허가"""
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        now = time.monotonic()
+        self._requests.refill(now)
+        self._tokens.refill(now)
+        while self._waiters and self._active < self.max_concurrency:
+            _, _, future, tokens = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            # 우선순위가 높은 호출이 버킷을 기다리는 동안 낮은 호출이 앞지르지 않도록 맨 앞만 확인
+            wait = max(
+                self._paused_until - now,
+                self._requests.wait_time(1),
+                self._tokens.wait_time(tokens),
+            )
+            if wait > 0:
+                self._wakeup = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._waiters)
+            self._requests.level -= 1
+            self._tokens.level -= self._tokens.clamp(tokens)
+            self._active += 1
+            future.set_result(None)
+
+    def _cache_key(self, prompt, kwargs: dict) -> str:
+        """모델 + 호출 옵션 + 공백을 정리한 프롬프트의 해시"""
+        if isinstance(prompt, str):
+            messages = [("human", " ".join(prompt.split()))]
+        else:
+            messages = [(message.type, " ".join(str(message.content).split())) for message in prompt]
+        payload = json.dumps(
+            [getattr(self.llm, "model_name", ""), kwargs, messages],
+            ensure_ascii=False,
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _estimate_tokens(self, prompt) -> int:
+        if isinstance(prompt, str):
+            length = len(prompt)
+        else:
+            length = sum(len(str(message.content)) for message in prompt)
+        return int(length / self.chars_per_token) + self.output_tokens
+
+    def _settle(self, reserved: float, response):
+        """실제 사용량/응답 헤더로 버킷 잔량 보정 (reserved : 호출 전에 버킷에서 실제로 차감한 양)"""
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            self._tokens.level -= usage["total_tokens"] - reserved
+        headers = (getattr(response, "response_metadata", None) or {}).get("headers")
+        if headers:
+            remaining_requests = headers.get("x-ratelimit-remaining-requests")
+            remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+            if remaining_requests is not None:
+                self._requests.level = min(self._requests.level, float(remaining_requests))
+            if remaining_tokens is not None:
+                self._tokens.level = min(self._tokens.level, float(remaining_tokens))
+
+    def _account(self, node: str, response, elapsed: float):
+        """토큰 사용량/예상 비용 집계 및 호출별 기록"""
+        usage = getattr(response, "usage_metadata", None)
+        if not usage:
+            return
+        cached = (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+        prompt_tokens = usage["input_tokens"]
+        completion_tokens = usage["output_tokens"]
+        cost = (
+            (prompt_tokens - cached) * self.prices["input"]
+            + cached * self.prices["cached_input"]
+            + completion_tokens * self.prices["output"]
+        ) / 1_000_000
+        LLM_TOKENS.inc(prompt_tokens, node=node, type="prompt")
+        LLM_TOKENS.inc(completion_tokens, node=node, type="completion")
+        LLM_TOKENS.inc(cached, node=node, type="cached")
+        LLM_COST.inc(cost, node=node)
+        self.prompt_tokens += prompt_tokens
+        self.cached_tokens += cached
+        logger.info(
+            "LLM 호출 ({node}) : {seconds:.2f}s, 입력 {prompt} (캐시 {cached}), 출력 {completion}",
+            node=node,
+            seconds=elapsed,
+            prompt=prompt_tokens,
+            cached=cached,
+            completion=completion_tokens,
+        )
+        record("prompt_tokens", prompt_tokens)
+        record("completion_tokens", completion_tokens)
+        record("cached_tokens", cached)
+        record("cost_usd", cost)
+
+    def _backoff(self, error: Exception, attempt: int) -> float:
+        """재시도 대기 시간 계산 (429 는 Retry-After 를 따르고 모든 호출을 일시정지)"""
+        import openai
+
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+        if isinstance(error, openai.RateLimitError):
+            self.rate_limited += 1
+            headers = error.response.headers
+            if headers.get("retry-after-ms"):
+                delay = max(delay, float(headers["retry-after-ms"]) / 1000)
+            elif headers.get("retry-after"):
+                try:
+                    delay = max(delay, float(headers["retry-after"]))
+                except ValueError:
+                    pass
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        return delay
@@ -0,0 +1,137 @@
+import sys
+import time
+import threading
+from typing import Callable
+from collections import OrderedDict
+from . import *
+from modules.agent import ChatbotAgent
+
+
+def _deep_size(obj, seen: set = None) -> int:
+    """
+    Des:
+        객체가 참조하는 컨테이너/문자열까지 포함한 대략적인 메모리 크기 계산 함수
+    """
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_size(k, seen) + _deep_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(_deep_size(item, seen) for item in obj)
+    elif hasattr(obj, "value") and hasattr(obj, "namespace"):  # store Item
+        size += _deep_size(obj.value, seen)
+    return size
+
+
+class AgentRegistry:
+    """
+    Des:
+        사용자별 ChatbotAgent 보관소
+            - 최대 보관 수를 넘으면 가장 오래 사용하지 않은 에이전트부터 제거 (LRU)
+            - idle_ttl 동안 요청이 없던 에이전트 제거
+            - 제거시 ChatbotAgent.release() 로 메모리에 있던 대화 기록 정리
+            - 실행중/대기중인 사용자(is_busy)는 제거하지 않음 (잠시 max_agents 를 넘을 수 있음)
+            - 제거된 사용자가 다시 오면 새 에이전트를 만들고, 사용자 정보는 DB에서 다시 불러옴 (_node_initialize)
+    """
+
+    def __init__(
+        self,
+        max_agents: int,
+        idle_ttl: float,
+        base_agent_bytes: int,
+        is_busy: Callable[[str], bool] = None,
+    ):
+        """
+        Args:
+            is_busy: 사용자 ID 로 처리중인 요청이 있는지 확인하는 함수 (UserInbox.is_busy)
+        """
+        self.max_agents = max_agents
+        self.idle_ttl = idle_ttl
+        self.base_agent_bytes = base_agent_bytes
+        self.is_busy = is_busy or (lambda user_id: False)
+        self.evictions = 0
+        self._agents = OrderedDict()  # user_id -> (last_access, agent)
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> ChatbotAgent:
+        """
+        Des:
+            사용자 에이전트를 반환하는 함수 (없으면 생성)
+        Args:
+            user_id: 사용자 ID
+        Returns:
+            ChatbotAgent: 사용자 에이전트
+        """
+        now = time.time()
+        with self._lock:
+            self._evict_idle(now)
+            if user_id in self._agents:
+                agent = self._agents.pop(user_id)[1]
+            else:
+                agent = ChatbotAgent()
+                agent.set_config(user_id=user_id)
+                logger.debug("새로운 사용자 에이전트를 생성했습니다. 사용자 id : {}", user_id)
+            self._agents[user_id] = (now, agent)
+            for evicted_id in list(self._agents):
+                if len(self._agents) <= self.max_agents or evicted_id == user_id:
+                    break
+                if self.is_busy(evicted_id):
+                    continue
+                self._agents.pop(evicted_id)[1].release()
+                self.evictions += 1
+                logger.debug("최대 보관 수 초과로 에이전트를 제거했습니다. 사용자 id : {}", evicted_id)
+            return agent
+
+    def __contains__(self, user_id: str) -> bool:
+        with self._lock:
+            return user_id in self._agents
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._agents)
+
+    def stats(self) -> dict:
+        """
+        Des:
+            보관중인 에이전트 수와 추정 메모리 사용량을 반환하는 함수
+        """
+        with self._lock:
+            self._evict_idle(time.time())
+            agents = [agent for _, agent in self._agents.values()]
+            evictions = self.evictions
+        estimated_bytes = sum(self._estimate_bytes(agent) for agent in agents)
+        return {
+            "resident_agents": len(agents),
+            "max_agents": self.max_agents,
+            "evictions": evictions,
+            "estimated_bytes": estimated_bytes,
+        }
+
+    def _evict_idle(self, now: float):
+        # _agents 는 마지막 사용 순서로 정렬되어 있으므로 앞에서부터 만료 여부만 확인
+        for user_id, (last_access, _) in list(self._agents.items()):
+            if now - last_access < self.idle_ttl:
+                break
+            if self.is_busy(user_id):
+                continue
+            self._agents.pop(user_id)[1].release()
+            self.evictions += 1
+            logger.debug("장시간 미사용 에이전트를 제거했습니다. 사용자 id : {}", user_id)
+
+    def _estimate_bytes(self, agent: ChatbotAgent) -> int:
+        # 그래프/체크포인터/스토어는 공용이므로, 이 사용자의 대화 기록과 롱텀 메모리만 계산
+        thread_id = agent.config["configurable"]["thread_id"]
+        user_id = agent.config["configurable"]["user_id"]
+        checkpointer = agent.graph.checkpointer
+        store = agent.graph.store
+        size = self.base_agent_bytes
+        size += _deep_size(getattr(checkpointer, "storage", {}).get(thread_id))
+        for name in ["writes", "blobs"]:
+            for key, value in list(getattr(checkpointer, name, {}).items()):
+                if key[0] == thread_id:
+                    size += _deep_size(value)
+        size += _deep_size(getattr(store, "_data", {}).get(("memories", user_id)))
+        return size
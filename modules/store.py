@@ -0,0 +1,279 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from contextlib import asynccontextmanager
+from typing import Iterable
+from langgraph.store.base import (
+    BaseStore,
+    GetOp,
+    Item,
+    ListNamespacesOp,
+    Op,
+    PutOp,
+    Result,
+    SearchItem,
+    SearchOp,
+)
+from . import *
+
+SEPARATOR = "\x1f"  # namespace 구분자 (사용자 ID 등에 나오지 않는 문자)
+
+
+def _encode_namespace(namespace: tuple) -> str:
+    # 접두어 검색이 가능하도록 각 요소 뒤에 구분자를 붙임 ("a", "b") -> "a\x1fb\x1f"
+    return "".join(f"{part}{SEPARATOR}" for part in namespace)
+
+
+def _decode_namespace(encoded: str) -> tuple:
+    return tuple(encoded.split(SEPARATOR)[:-1])
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={system_config.db.synchronous}")
+    conn.execute(f"PRAGMA busy_timeout={system_config.db.busy_timeout}")
+    return conn
+
+
+class SqliteStore(BaseStore):
+    """
+    Des:
+        SQLite 기반 롱텀 메모리 스토어 (InMemoryStore 대체)
+            - 여러 워커 프로세스가 같은 DB 파일(WAL 모드)을 공유해서, 어느 워커든 같은 사용자 정보/세션을 읽음
+            - 스레드별 커넥션 재사용, 비동기 메서드는 스레드에서 실행
+            - 벡터 검색(index)은 지원하지 않음 (namespace 접두어 + 값 일치 필터만 지원)
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connect().execute(
+            """
+            CREATE TABLE IF NOT EXISTS store (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+        """
+        )
+
+    def batch(self, ops: Iterable[Op]) -> list[Result]:
+        conn = self._connect()
+        results = []
+        for op in ops:
+            if isinstance(op, GetOp):
+                results.append(self._get(conn, op))
+            elif isinstance(op, PutOp):
+                self._put(conn, op)
+                results.append(None)
+            elif isinstance(op, SearchOp):
+                results.append(self._search(conn, op))
+            elif isinstance(op, ListNamespacesOp):
+                results.append(self._list_namespaces(conn, op))
+            else:
+                raise ValueError(f"지원하지 않는 연산입니다: {op}")
+        return results
+
+    async def abatch(self, ops: Iterable[Op]) -> list[Result]:
+        return await asyncio.to_thread(self.batch, list(ops))
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = _connect(self.db_path)
+        return conn
+
+    def _get(self, conn: sqlite3.Connection, op: GetOp):
+        row = conn.execute(
+            "SELECT value, created_at, updated_at FROM store WHERE namespace = ? AND key = ?",
+            (_encode_namespace(op.namespace), op.key),
+        ).fetchone()
+        if row is None:
+            return None
+        return Item(
+            namespace=op.namespace,
+            key=op.key,
+            value=json.loads(row[0]),
+            created_at=datetime.fromtimestamp(row[1], timezone.utc),
+            updated_at=datetime.fromtimestamp(row[2], timezone.utc),
+        )
+
+    def _put(self, conn: sqlite3.Connection, op: PutOp):
+        namespace = _encode_namespace(op.namespace)
+        if op.value is None:
+            conn.execute(
+                "DELETE FROM store WHERE namespace = ? AND key = ?", (namespace, op.key)
+            )
+            return
+        now = time.time()
+        conn.execute(
+            """
+            INSERT INTO store (namespace, key, value, created_at, updated_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(namespace, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at
+            """,
+            (namespace, op.key, json.dumps(op.value, ensure_ascii=False), now, now),
+        )
+
+    def _search(self, conn: sqlite3.Connection, op: SearchOp) -> list[SearchItem]:
+        prefix = _encode_namespace(op.namespace_prefix)
+        rows = conn.execute(
+            """
+            SELECT namespace, key, value, created_at, updated_at FROM store
+            WHERE substr(namespace, 1, ?) = ? ORDER BY updated_at DESC
+            """,
+            (len(prefix), prefix),
+        ).fetchall()
+        items = []
+        for namespace, key, value, created_at, updated_at in rows:
+            value = json.loads(value)
+            if op.filter and any(value.get(k) != v for k, v in op.filter.items()):
+                continue
+            items.append(
+                SearchItem(
+                    namespace=_decode_namespace(namespace),
+                    key=key,
+                    value=value,
+                    created_at=datetime.fromtimestamp(created_at, timezone.utc),
+                    updated_at=datetime.fromtimestamp(updated_at, timezone.utc),
+                )
+            )
+        return items[op.offset : op.offset + op.limit]
+
+    def _list_namespaces(self, conn: sqlite3.Connection, op: ListNamespacesOp) -> list[tuple]:
+        namespaces = [
+            _decode_namespace(row[0])
+            for row in conn.execute("SELECT DISTINCT namespace FROM store ORDER BY namespace")
+        ]
+        for condition in op.match_conditions or ():
+            path = tuple(condition.path)
+            if condition.match_type == "prefix":
+                match = lambda ns: len(ns) >= len(path) and all(
+                    p == "*" or p == n for p, n in zip(path, ns)
+                )
+            else:
+                match = lambda ns: len(ns) >= len(path) and all(
+                    p == "*" or p == n for p, n in zip(path, ns[len(ns) - len(path) :])
+                )
+            namespaces = [ns for ns in namespaces if match(ns)]
+        if op.max_depth is not None:
+            namespaces = sorted({ns[: op.max_depth] for ns in namespaces})
+        return namespaces[op.offset : op.offset + op.limit]
+
+
+class LeaseLostError(RuntimeError):
+    """
+    Des:
+        잠금을 잡고 실행하는 도중 연장에 실패해 잠금을 잃었을 때 with 블록에서 발생하는 에러
+    """
+
+
+class SqliteLeaseLock:
+    """
+    Des:
+        SQLite 기반 사용자별 임대(lease) 잠금
+            - 여러 워커 프로세스에서 같은 사용자 요청이 동시에 처리되지 않도록 함
+            - 잠금을 잡고 있는 동안 ttl/3 마다 만료 시각을 연장 (한 턴이 ttl 보다 오래 걸려도 유지)
+            - 잠금을 잡은 워커가 죽으면 연장이 멈추므로 ttl 이 지나면 다른 워커가 가져감
+            - 잠금마다 고유한 owner 를 쓰므로 같은 프로세스 안의 다른 코루틴이 잡은 잠금을 연장/해제하지 않음
+            - 연장에 실패해 잠금을 잃으면 with 블록을 취소하고 LeaseLostError 발생 (상호 배제 없이 계속 실행하지 않음)
+    """
+
+    def __init__(self, db_path: str, ttl: float, poll_interval: float):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        self._connect().execute(
+            """
+            CREATE TABLE IF NOT EXISTS locks (
+                key TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """
+        )
+
+    @asynccontextmanager
+    async def hold(self, key: str):
+        """
+        Des:
+            key 잠금을 잡고 with 블록을 실행하는 함수 (잡을 때까지 poll_interval 간격으로 재시도)
+        """
+        owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+        while not await asyncio.to_thread(self._try_acquire, key, owner):
+            await asyncio.sleep(self.poll_interval)
+        holder = asyncio.current_task()
+        heartbeat = asyncio.create_task(self._keep_alive(key, owner, holder))
+        try:
+            yield
+        except asyncio.CancelledError:
+            if heartbeat.done() and not heartbeat.cancelled() and heartbeat.result() is False:
+                # 잠금을 잃어서 취소된 경우 (외부에서 취소된 경우는 그대로 전달)
+                holder.uncancel()
+                raise LeaseLostError(f"잠금을 잃었습니다: {key}") from None
+            raise
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+            await asyncio.to_thread(self._release, key, owner)
+
+    async def _keep_alive(self, key: str, owner: str, holder: asyncio.Task) -> bool:
+        """
+        Des:
+            ttl/3 마다 잠금을 연장하는 함수
+                - 다른 워커가 가져갔거나 연장에 계속 실패해 만료되면 holder 를 취소하고 False 반환
+        """
+        expires_at = time.time() + self.ttl
+        while True:
+            await asyncio.sleep(self.ttl / 3)
+            try:
+                renewed = await asyncio.to_thread(self._renew, key, owner)
+            except Exception as e:
+                logger.error("잠금 연장 실패 ({}): {}", key, e)
+                if time.time() < expires_at:
+                    continue
+                renewed = False
+            if not renewed:
+                logger.warning("잠금이 만료되어 실행을 중단합니다: {}", key)
+                holder.cancel()
+                return False
+            expires_at = time.time() + self.ttl
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = _connect(self.db_path)
+        return conn
+
+    def _try_acquire(self, key: str, owner: str) -> bool:
+        now = time.time()
+        cursor = self._connect().execute(
+            """
+            INSERT INTO locks (key, owner, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+            WHERE locks.expires_at < ?
+            """,
+            (key, owner, now + self.ttl, now),
+        )
+        return cursor.rowcount == 1
+
+    def _renew(self, key: str, owner: str) -> bool:
+        cursor = self._connect().execute(
+            "UPDATE locks SET expires_at = ? WHERE key = ? AND owner = ?",
+            (time.time() + self.ttl, key, owner),
+        )
+        return cursor.rowcount == 1
+
+    def _release(self, key: str, owner: str):
+        self._connect().execute(
+            "DELETE FROM locks WHERE key = ? AND owner = ?", (key, owner)
+        )
@@ -0,0 +1,89 @@
+import asyncio
+import operator
+from typing import Annotated, TypedDict
+import pytest
+from langgraph.graph import START, END, StateGraph
+from modules.checkpoint import BoundedSqliteSaver
+
+
+class CounterState(TypedDict):
+    turns: Annotated[list, operator.add]
+
+
+def _build_graph(checkpointer):
+    builder = StateGraph(CounterState)
+    builder.add_node("step", lambda state: {"turns": [len(state["turns"])]})
+    builder.add_edge(START, "step")
+    builder.add_edge("step", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "checkpoints.db")
+
+
+def _config(thread_id: str) -> dict:
+    return {"configurable": {"thread_id": thread_id}}
+
+
+def test_graph_round_trip(db_path):
+    graph = _build_graph(BoundedSqliteSaver(db_path, max_checkpoints=10))
+    for _ in range(3):
+        graph.invoke({"turns": ["user"]}, _config("t1"))
+
+    state = graph.get_state(_config("t1"))
+    assert state.values["turns"] == ["user", 1, "user", 3, "user", 5]
+    history = list(graph.checkpointer.list(_config("t1")))
+    assert [c.checkpoint["id"] for c in history] == sorted(
+        (c.checkpoint["id"] for c in history), reverse=True
+    )
+    assert history[0].config["configurable"]["checkpoint_id"] == state.config["configurable"]["checkpoint_id"]
+    # 다른 thread 에는 영향 없음
+    assert graph.get_state(_config("t2")).values == {}
+
+
+def test_compaction_keeps_latest_resumable(db_path):
+    graph = _build_graph(BoundedSqliteSaver(db_path, max_checkpoints=2))
+    for _ in range(4):
+        graph.invoke({"turns": ["user"]}, _config("t1"))
+
+    assert len(list(graph.checkpointer.list(_config("t1")))) == 2
+    # 새 프로세스처럼 같은 DB 파일을 다시 열어서 이어서 실행
+    resumed = _build_graph(BoundedSqliteSaver(db_path, max_checkpoints=2))
+    assert len(resumed.get_state(_config("t1")).values["turns"]) == 8
+    resumed.invoke({"turns": ["user"]}, _config("t1"))
+    assert resumed.get_state(_config("t1")).values["turns"][-2:] == ["user", 9]
+    assert len(list(resumed.checkpointer.list(_config("t1")))) == 2
+
+
+def test_put_writes_are_returned_as_pending_writes(db_path):
+    saver = BoundedSqliteSaver(db_path, max_checkpoints=2)
+    graph = _build_graph(saver)
+    graph.invoke({"turns": ["user"]}, _config("t1"))
+    config = saver.get_tuple(_config("t1")).config
+
+    saver.put_writes(config, [("turns", ["a"]), ("turns", ["b"])], task_id="task-1")
+    # 일반 채널은 같은 (task_id, idx) 가 이미 있으면 유지
+    saver.put_writes(config, [("turns", ["c"])], task_id="task-1")
+
+    pending = saver.get_tuple(config).pending_writes
+    assert pending == [("task-1", "turns", ["a"]), ("task-1", "turns", ["b"])]
+
+
+def test_async_graph_and_delete_thread(db_path):
+    saver = BoundedSqliteSaver(db_path, max_checkpoints=2)
+    graph = _build_graph(saver)
+
+    async def run():
+        await graph.ainvoke({"turns": ["user"]}, _config("t1"))
+        await graph.ainvoke({"turns": ["user"]}, _config("t1"))
+        listed = [c async for c in saver.alist(_config("t1"))]
+        latest = await saver.aget_tuple(_config("t1"))
+        await saver.adelete_thread("t1")
+        return listed, latest, await saver.aget_tuple(_config("t1"))
+
+    listed, latest, deleted = asyncio.run(run())
+    assert len(listed) == 2
+    assert latest.checkpoint["channel_values"]["turns"] == ["user", 1, "user", 3]
+    assert deleted is None
@@ -0,0 +1,242 @@
+import atexit
+import asyncio
+import random
+import threading
+from contextlib import asynccontextmanager
+from datetime import datetime
+from playwright.async_api import async_playwright
+from configs.config import system_config
+from utils.loop import get_io_loop
+from utils.logger import logger
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+LAUNCH_ARGS = [
+    f"--user-agent={USER_AGENT}",
+    "--disable-blink-features=AutomationControlled",
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+]
+INIT_SCRIPT = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => false,
+    });
+"""
+
+
+async def scrape_google(page, search_term: str, SEARCH_RESULT_COUNT: int) -> list:
+    """
+    Des:
+        주어진 페이지에서 구글 검색을 수행하고 결과를 수집하는 함수
+    Args:
+        page: Playwright 페이지 (async API)
+        search_term (str): 검색할 키워드
+        SEARCH_RESULT_COUNT (int): 검색 결과 수
+    Returns:
+        list: 검색 결과 ({"title", "link"}) 리스트
+    """
+    try:
+        await page.wait_for_timeout(2000 + random.randint(500, 1500))
+        await page.goto("https://www.google.com")
+        await page.wait_for_timeout(1000 + random.randint(500, 1000))
+        await page.type("#APjFqb", search_term, delay=100)
+        await page.wait_for_timeout(500)
+        await page.press("#APjFqb", "Enter")
+        await page.wait_for_selector("div.yuRUbf", timeout=10000)
+        await page.wait_for_timeout(2000)
+
+        results = []
+        search_results = await page.query_selector_all("div.yuRUbf")
+        for result in search_results[:SEARCH_RESULT_COUNT]:
+            title_elem = await result.query_selector("h3.LC20lb")
+            title = await title_elem.inner_text() if title_elem else ""
+            link_elem = await result.query_selector("a")
+            link = await link_elem.get_attribute("href") if link_elem else ""
+            results.append({"title": title, "link": link})
+        return results
+    except Exception:
+        try:
+            await page.screenshot(
+                path=f'{datetime.now().strftime("%Y%m%d_%H%M%S")}_error.png'
+            )
+        except Exception:
+            pass
+        raise
+
+
+class _Slot:
+    """브라우저 풀에서 대여되는 컨텍스트/페이지 묶음"""
+
+    def __init__(self, context=None, page=None):
+        self.context = context
+        self.page = page
+        self.uses = 0
+
+
+class BrowserPool:
+    """
+    Des:
+        미리 띄워둔 Chromium 브라우저의 컨텍스트/페이지를 대여해주는 풀
+            - 공용 I/O 루프(utils.loop)에서 async Playwright 를 실행
+            - 동기/비동기 어느 쪽에서 호출해도 같은 풀을 사용
+            - 대여시 상태 확인, max_uses 초과 또는 에러 발생시 컨텍스트 교체
+            - 브라우저 프로세스가 죽으면 다시 실행
+    """
+
+    def __init__(self, size: int, max_uses: int, lease_timeout: float):
+        self.size = size
+        self.max_uses = max_uses
+        self.lease_timeout = lease_timeout
+        self._io_loop = get_io_loop()
+        self._started = False
+        self._playwright = None
+        self._browser = None
+        self._slots = None
+        self._relaunch_lock = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """
+        Des:
+            브라우저/페이지를 미리 준비하는 함수
+        """
+        with self._start_lock:
+            if self._started:
+                return
+            self._io_loop.run(self._warmup())
+            self._started = True
+            logger.info("브라우저 풀 준비 완료 (size={})", self.size)
+
+    def search(self, search_term: str, SEARCH_RESULT_COUNT: int, timeout: float = None) -> list:
+        """
+        Des:
+            풀에서 페이지를 대여해 구글 검색을 수행하는 함수 (동기)
+        """
+        self.start()
+        return self._io_loop.run(
+            self._search(search_term, SEARCH_RESULT_COUNT), timeout=timeout
+        )
+
+    async def asearch(self, search_term: str, SEARCH_RESULT_COUNT: int, timeout: float = None) -> list:
+        """
+        Des:
+            풀에서 페이지를 대여해 구글 검색을 수행하는 함수 (비동기)
+                - 호출한 이벤트 루프를 막지 않고 공용 I/O 루프의 결과를 기다림
+        """
+        if not self._started:
+            await asyncio.to_thread(self.start)
+        future = self._io_loop.submit(self._search(search_term, SEARCH_RESULT_COUNT))
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+
+    def close(self):
+        """
+        Des:
+            브라우저를 종료하는 함수
+        """
+        with self._start_lock:
+            if not self._started:
+                return
+            try:
+                self._io_loop.run(self._shutdown(), timeout=10)
+            except Exception as e:
+                logger.error("브라우저 풀 종료 중 에러 발생: {}", e)
+            self._started = False
+
+    async def _warmup(self):
+        self._relaunch_lock = asyncio.Lock()
+        self._slots = asyncio.Queue()
+        self._playwright = await async_playwright().start()
+        await self._launch_browser()
+        for _ in range(self.size):
+            try:
+                slot = await self._new_slot()
+            except Exception as e:
+                logger.error("페이지 준비 실패: {}", e)
+                slot = _Slot()
+            self._slots.put_nowait(slot)
+
+    async def _launch_browser(self):
+        self._browser = await self._playwright.chromium.launch(
+            headless=True, args=LAUNCH_ARGS
+        )
+
+    async def _new_slot(self) -> _Slot:
+        if self._browser is None or not self._browser.is_connected():
+            async with self._relaunch_lock:
+                if self._browser is None or not self._browser.is_connected():
+                    logger.warning("브라우저 연결이 끊어져 다시 실행합니다.")
+                    await self._launch_browser()
+        context = await self._browser.new_context(
+            viewport={"width": 1920, "height": 1080},
+            user_agent=USER_AGENT,
+            java_script_enabled=True,
+        )
+        page = await context.new_page()
+        await page.add_init_script(INIT_SCRIPT)
+        return _Slot(context, page)
+
+    async def _recycle(self, slot: _Slot) -> _Slot:
+        if slot.context is not None:
+            try:
+                await slot.context.close()
+            except Exception:
+                pass
+        return await self._new_slot()
+
+    def _is_healthy(self, slot: _Slot) -> bool:
+        return (
+            slot.page is not None
+            and not slot.page.is_closed()
+            and self._browser is not None
+            and self._browser.is_connected()
+        )
+
+    @asynccontextmanager
+    async def _lease(self):
+        slot = await asyncio.wait_for(self._slots.get(), timeout=self.lease_timeout)
+        healthy = False
+        try:
+            if not self._is_healthy(slot):
+                slot = await self._recycle(slot)
+            yield slot.page
+            healthy = True
+        finally:
+            slot.uses += 1
+            if not healthy or slot.uses >= self.max_uses:
+                try:
+                    slot = await self._recycle(slot)
+                except Exception as e:
+                    # 교체 실패시 빈 슬롯을 반납 -> 다음 대여시 다시 생성
+                    logger.error("컨텍스트 교체 실패: {}", e)
+                    slot = _Slot()
+            self._slots.put_nowait(slot)
+
+    async def _search(self, search_term: str, SEARCH_RESULT_COUNT: int) -> list:
+        async with self._lease() as page:
+            return await scrape_google(page, search_term, SEARCH_RESULT_COUNT)
+
+    async def _shutdown(self):
+        if self._browser is not None:
+            await self._browser.close()
+        if self._playwright is not None:
+            await self._playwright.stop()
+
+
+_browser_pool = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """
+    Des:
+        프로세스 공용 브라우저 풀을 반환하는 함수
+    """
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool(
+                size=system_config.browser_pool.size,
+                max_uses=system_config.browser_pool.max_uses,
+                lease_timeout=system_config.browser_pool.lease_timeout,
+            )
+            atexit.register(_browser_pool.close)
+    return _browser_pool
@@ -0,0 +1,275 @@
+import os
+import json
+import time
+import atexit
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict
+from importlib.resources import files
+from configs.config import system_config
+from utils.logger import logger
+
+
+class TTLCache:
+    """
+    Des:
+        TTL + LRU 캐시
+            - 메모리: 항목 수/용량(bytes) 한도를 넘으면 가장 오래 사용하지 않은 항목부터 제거
+            - 디스크(선택): SQLite 에 함께 저장해서 재시작 후에도 유지
+                - 쓰기는 모아서 flush_interval 마다 백그라운드 스레드에서 반영, 만료 항목 삭제는 purge_interval 마다
+                - 비동기 조회(aget)는 메모리에 없을 때만 스레드에서 디스크 조회 (이벤트 루프를 막지 않음)
+            - 값은 JSON 으로 직렬화 가능한 값만 저장
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        max_entries: int,
+        max_bytes: int,
+        db_path: str = None,
+        flush_interval: float = 1.0,
+        purge_interval: float = 600.0,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.purge_interval = purge_interval
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()  # key -> (expires_at, value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        if db_path:
+            self._pending = {}  # key -> (value JSON, expires_at), 디스크 반영 대기
+            self._db_lock = threading.Lock()
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS cache (
+                    namespace TEXT,
+                    key TEXT,
+                    value TEXT,
+                    expires_at REAL,
+                    PRIMARY KEY (namespace, key)
+                )
+            """
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_expires ON cache (namespace, expires_at)"
+            )
+            self._conn.commit()
+            self._stop = threading.Event()
+            self._thread = threading.Thread(
+                target=self._flush_loop, name=f"cache-flush-{name}", daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.close)
+
+    def get(self, key: str):
+        """
+        Des:
+            캐시 조회 함수
+        Returns:
+            저장된 값, 없거나 만료되었으면 None
+        """
+        found, value = self._get_memory(key)
+        if found:
+            return value
+        return self._get_disk(key)
+
+    async def aget(self, key: str):
+        """
+        Des:
+            캐시 조회 함수 (비동기, 디스크 조회는 스레드에서 실행)
+        """
+        found, value = self._get_memory(key)
+        if found:
+            return value
+        return await asyncio.to_thread(self._get_disk, key)
+
+    def set(self, key: str, value):
+        """
+        Des:
+            캐시 저장 함수 (디스크 반영은 백그라운드에서 모아서 수행)
+        """
+        serialized = json.dumps(value, ensure_ascii=False)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._put(key, value, expires_at, len(serialized.encode()))
+            if self._conn is not None:
+                self._pending[key] = (serialized, expires_at)
+
+    def flush(self):
+        """
+        Des:
+            디스크 반영 대기중인 항목을 한번에 저장하는 함수
+        """
+        if self._conn is None:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        with self._db_lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                [(self.name, key, value, expires_at) for key, (value, expires_at) in pending.items()],
+            )
+            self._conn.commit()
+
+    def purge(self):
+        """
+        Des:
+            디스크에서 만료된 항목을 삭제하는 함수
+        """
+        if self._conn is None:
+            return
+        with self._db_lock:
+            self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND expires_at <= ?",
+                (self.name, time.time()),
+            )
+            self._conn.commit()
+
+    def close(self):
+        """
+        Des:
+            백그라운드 반영을 멈추고 남은 항목을 디스크에 저장하는 함수
+        """
+        if self._conn is None:
+            return
+        self._stop.set()
+        self.flush()
+
+    def stats(self) -> dict:
+        """
+        Des:
+            캐시 적중/미스 통계 반환 함수
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def _get_memory(self, key: str) -> tuple[bool, object]:
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return True, entry[1]
+                self._pop(key)
+            if self._conn is None:
+                self.misses += 1
+                return True, None
+            # 메모리에서 밀려났지만 아직 디스크에 반영되지 않은 항목
+            pending = self._pending.get(key)
+            if pending is not None and pending[1] > now:
+                value = json.loads(pending[0])
+                self._put(key, value, pending[1], len(pending[0].encode()))
+                self.hits += 1
+                return True, value
+        return False, None
+
+    def _get_disk(self, key: str):
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.name, key),
+            ).fetchone()
+        with self._lock:
+            if row and row[1] > time.time():
+                value = json.loads(row[0])
+                self._put(key, value, row[1], len(row[0].encode()))
+                self.hits += 1
+                self.disk_hits += 1
+                return value
+            self.misses += 1
+            return None
+
+    def _flush_loop(self):
+        last_purge = time.monotonic()
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+                if time.monotonic() - last_purge >= self.purge_interval:
+                    self.purge()
+                    last_purge = time.monotonic()
+            except Exception as e:
+                logger.error("캐시({}) 디스크 반영 실패: {}", self.name, e)
+
+    def _put(self, key: str, value, expires_at: float, size: int):
+        if key in self._data:
+            self._pop(key)
+        self._data[key] = (expires_at, value, size)
+        self._bytes += size
+        while self._data and (
+            len(self._data) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._data))
+            self._pop(oldest)
+            self.evictions += 1
+
+    def _pop(self, key: str):
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name: str) -> TTLCache:
+    """
+    Des:
+        system_config.cache.<name> 설정으로 만든 프로세스 공용 캐시를 반환하는 함수
+    Args:
+        name: 캐시 이름 (search, content)
+    """
+    with _caches_lock:
+        if name not in _caches:
+            config = system_config.cache[name]
+            db_path = (
+                os.path.join(files("data"), "cache.db")
+                if system_config.cache.persist
+                else None
+            )
+            _caches[name] = TTLCache(
+                name=name,
+                ttl=config.ttl,
+                max_entries=config.max_entries,
+                max_bytes=config.max_bytes,
+                db_path=db_path,
+                flush_interval=system_config.cache.flush_interval,
+                purge_interval=system_config.cache.purge_interval,
+            )
+    return _caches[name]
+
+
+def cache_stats() -> list[dict]:
+    """
+    Des:
+        생성된 모든 캐시의 통계를 반환하는 함수
+    """
+    with _caches_lock:
+        caches = list(_caches.values())
+    return [cache.stats() for cache in caches]
@@ -0,0 +1,286 @@
+import re
+from html.parser import HTMLParser
+
+# 본문 후보가 될 수 없는 태그 (안쪽 텍스트는 모두 버림)
+SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "object",
+    "nav", "footer", "aside", "button", "select", "textarea", "header", "title",
+}
+# 이 태그가 열리거나 닫히면 문단이 끝남
+BLOCK_TAGS = {
+    "address", "article", "blockquote", "body", "dd", "div", "dl", "dt", "figcaption",
+    "figure", "h1", "h2", "h3", "h4", "h5", "h6", "hr", "li", "main", "ol", "p", "pre",
+    "section", "table", "tbody", "td", "th", "tr", "ul", "br",
+}
+# 문단 자체인 태그 (점수는 이 태그를 담고 있는 요소에 더함)
+PARAGRAPH_TAGS = {
+    "p", "pre", "li", "td", "th", "blockquote", "dd", "dt", "figcaption",
+    "h1", "h2", "h3", "h4", "h5", "h6",
+}
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+}
+# class/id 로 건너뛰지 않는 태그 (<html class="sidebar-visible"> 처럼 페이지 전체에 붙는 class 가 있음)
+STRUCTURE_TAGS = {"html", "body", "main", "article"}
+# 태그별 기본 점수 (readability 방식)
+TAG_WEIGHTS = {
+    "article": 10, "main": 10, "div": 5, "section": 3, "pre": 3, "td": 3, "blockquote": 3,
+    "address": -3, "ol": -3, "ul": -3, "dl": -3, "dd": -3, "dt": -3, "li": -3,
+    "h1": -5, "h2": -5, "h3": -5, "h4": -5, "h5": -5, "h6": -5, "th": -5,
+}
+# class/id 로 판단하는 광고, 댓글, 메뉴 등 (본문 후보 단어가 같이 있으면 유지)
+UNLIKELY = re.compile(
+    r"-ad-|banner|breadcrumb|combx|comment|community|cookie|disqus|gdpr|menu|"
+    r"related|remark|replies|rss|share|shoutbox|sidebar|skyscraper|social|sponsor|"
+    r"popup|pagination|pager|subscribe|login|reply|recommend|ranking|copyright",
+    re.IGNORECASE,
+)
+MAYBE = re.compile(r"and|article|body|column|content|main|shadow", re.IGNORECASE)
+POSITIVE = re.compile(
+    r"article|body|content|entry|hentry|main|page|post|text|blog|story|news_?view|dic_area",
+    re.IGNORECASE,
+)
+NEGATIVE = re.compile(
+    r"-ad-|hidden|banner|combx|comment|contact|foot|footnote|masthead|media|meta|"
+    r"outbrain|promo|related|scroll|share|sidebar|sponsor|shopping|tags|tool|widget",
+    re.IGNORECASE,
+)
+WHITESPACE = re.compile(r"\s+")
+
+
+class _Node:
+    """열린 요소 하나 (본문 후보 점수 계산용)"""
+
+    __slots__ = ("tag", "parent", "weight", "score", "scored", "start", "end", "chars", "link_chars")
+
+    def __init__(self, tag: str, parent, weight: int, start: int):
+        self.tag = tag
+        self.parent = parent
+        self.weight = weight
+        self.score = 0.0
+        self.scored = False
+        self.start = start  # 이 요소 안의 문단 범위 [start, end)
+        self.end = start
+        self.chars = 0
+        self.link_chars = 0
+
+
+class ContentExtractor(HTMLParser):
+    """
+    Des:
+        HTML 을 한번만 읽으면서 본문과 설명(meta description)을 추출하는 파서
+            - feed() 로 조각씩 넣을 수 있고, max_chars 만큼 넣으면 이후 입력은 무시 (done)
+            - script/style/nav/footer, 광고/댓글/메뉴로 보이는 class/id 요소는 건너뜀
+            - 문단별 글자 수, 쉼표 수, 링크 비율로 요소 점수를 매겨 본문 요소를 선택 (readability 방식)
+            - 결과는 문단 사이를 빈 줄로 구분 (utils.ranking.split_passages 입력 형식)
+    """
+
+    def __init__(self, max_chars: int, max_text_chars: int, min_paragraph_chars: int = 25):
+        """
+        Args:
+            max_chars: 읽을 HTML 최대 길이 (넘으면 이후 입력 무시)
+            max_text_chars: 반환할 본문 최대 길이
+            min_paragraph_chars: 점수 계산에 포함할 문단 최소 길이
+        """
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.max_text_chars = max_text_chars
+        self.min_paragraph_chars = min_paragraph_chars
+        self.description = ""
+        self.received = 0
+        self.done = False
+        self._og_description = ""
+        self._root = _Node("#root", None, 0, 0)
+        self._stack = [self._root]
+        self._skip = 0  # 건너뛰는 요소 깊이
+        self._link = 0  # <a> 깊이
+        self._buffer = []
+        self._buffer_link_chars = 0
+        self._paragraphs = []  # (text, link_chars)
+        self._nodes = []
+
+    def feed(self, data: str):
+        if self.done:
+            return
+        remaining = self.max_chars - self.received
+        if len(data) >= remaining:
+            data = data[:remaining]
+            self.done = True
+        self.received += len(data)
+        super().feed(data)
+
+    def result(self) -> tuple[str, str]:
+        """
+        Des:
+            입력을 마치고 (설명, 본문) 을 반환하는 함수
+        """
+        self.close()
+        self._flush()
+        while len(self._stack) > 1:
+            self._pop()
+        self._root.end = len(self._paragraphs)
+        return self.description or self._og_description, self._select()
+
+    def handle_starttag(self, tag: str, attrs: list):
+        if tag == "meta":
+            self._meta(dict(attrs))
+            return
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag in VOID_TAGS:
+            return
+        if tag == "p" and self._stack[-1].tag == "p":
+            self._pop()  # 닫히지 않은 <p>
+        attrs = dict(attrs)
+        if self._skip or tag in SKIP_TAGS or (tag not in STRUCTURE_TAGS and self._unlikely(attrs)):
+            self._skip += 1
+            self._stack.append(_Node(tag, self._stack[-1], 0, len(self._paragraphs)))
+            return
+        if tag == "a":
+            self._link += 1
+        node = _Node(tag, self._stack[-1], self._weight(tag, attrs), len(self._paragraphs))
+        self._stack.append(node)
+        self._nodes.append(node)
+
+    def handle_endtag(self, tag: str):
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag in VOID_TAGS:
+            return
+        # 짝이 안 맞는 HTML : 같은 태그가 열려 있을 때만 그 위치까지 닫음
+        for i in range(len(self._stack) - 1, 0, -1):
+            if self._stack[i].tag == tag:
+                while len(self._stack) > i:
+                    self._pop()
+                return
+
+    def handle_data(self, data: str):
+        if self._skip:
+            return
+        self._buffer.append(data)
+        if self._link:
+            self._buffer_link_chars += len(data.strip())
+
+    def _meta(self, attrs: dict):
+        content = (attrs.get("content") or "").strip()
+        name = (attrs.get("name") or attrs.get("property") or "").lower()
+        if name == "description" and not self.description:
+            self.description = content
+        elif name == "og:description" and not self._og_description:
+            self._og_description = content
+
+    def _pop(self):
+        node = self._stack.pop()
+        if node.tag == "a" and not self._skip:
+            self._link -= 1
+        if self._skip:
+            self._skip -= 1
+            return
+        node.end = len(self._paragraphs)
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        text = WHITESPACE.sub(" ", "".join(self._buffer)).strip()
+        link_chars = self._buffer_link_chars
+        self._buffer = []
+        self._buffer_link_chars = 0
+        if not text:
+            return
+        owner = next(
+            node for node in reversed(self._stack) if node.tag in BLOCK_TAGS or node is self._root
+        )
+        self._paragraphs.append((text, link_chars))
+        node = owner
+        while node is not None:
+            node.chars += len(text)
+            node.link_chars += min(link_chars, len(text))
+            node = node.parent
+        if len(text) < self.min_paragraph_chars:
+            return
+        # 문단 점수를 문단을 담은 요소와 그 부모(절반)에 더함 (<p> 등은 <p> 를 담은 요소부터)
+        score = 1 + text.count(",") + text.count("，") + min(len(text) // 100, 3)
+        container = owner.parent if owner.tag in PARAGRAPH_TAGS else owner
+        for node, share in ((container, 1.0), (container and container.parent, 0.5)):
+            if node is None or node is self._root:
+                break
+            if not node.scored:
+                node.scored = True
+                node.score = node.weight
+            node.score += score * share
+
+    def _select(self) -> str:
+        candidates = [node for node in self._nodes if node.scored]
+        if not candidates:
+            return self._join(self._paragraphs)
+        best = max(candidates, key=self._final_score)
+        best_score = self._final_score(best)
+        # 본문이 여러 형제 요소로 나뉜 페이지 : 점수가 충분한 형제 요소도 포함
+        threshold = max(10, best_score * 0.2)
+        ranges = [
+            (node.start, node.end)
+            for node in candidates
+            if node is best
+            or (node.parent is best.parent and self._final_score(node) >= threshold)
+        ]
+        selected = []
+        for start, end in sorted(ranges):
+            selected.extend(self._paragraphs[start:end])
+        return self._join(selected)
+
+    def _join(self, paragraphs: list) -> str:
+        texts = []
+        total = 0
+        seen = set()
+        for text, link_chars in paragraphs:
+            # 링크가 대부분인 문단(관련 기사 목록 등)과 중복 문단 제외
+            if link_chars > len(text) * 0.5 or text in seen:
+                continue
+            seen.add(text)
+            texts.append(text)
+            total += len(text)
+            if total >= self.max_text_chars:
+                break
+        return "\n\n".join(texts)[: self.max_text_chars]
+
+    @staticmethod
+    def _final_score(node: _Node) -> float:
+        link_density = node.link_chars / node.chars if node.chars else 0.0
+        return node.score * (1 - link_density)
+
+    @staticmethod
+    def _unlikely(attrs: dict) -> bool:
+        if "hidden" in attrs or attrs.get("aria-hidden") == "true":
+            return True
+        if "display:none" in (attrs.get("style") or "").replace(" ", ""):
+            return True
+        names = f'{attrs.get("class") or ""} {attrs.get("id") or ""}'
+        return bool(UNLIKELY.search(names)) and not MAYBE.search(names)
+
+    @staticmethod
+    def _weight(tag: str, attrs: dict) -> int:
+        weight = TAG_WEIGHTS.get(tag, 0)
+        for name in (attrs.get("class"), attrs.get("id")):
+            if name:
+                if POSITIVE.search(name):
+                    weight += 25
+                if NEGATIVE.search(name):
+                    weight -= 25
+        return weight
+
+
+def extract_main_content(html: str, max_chars: int, max_text_chars: int) -> tuple[str, str]:
+    """
+    Des:
+        HTML 문자열에서 (설명, 본문) 을 추출하는 함수
+    Args:
+        html: 페이지 HTML
+        max_chars: 읽을 HTML 최대 길이
+        max_text_chars: 반환할 본문 최대 길이
+    Returns:
+        tuple[str, str]: (meta description, 본문)
+    """
+    extractor = ContentExtractor(max_chars=max_chars, max_text_chars=max_text_chars)
+    extractor.feed(html)
+    return extractor.result()
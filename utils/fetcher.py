@@ -0,0 +1,230 @@
+import re
+import codecs
+import atexit
+import asyncio
+import threading
+import httpx
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+from configs.config import system_config
+from utils.cache import get_cache
+from utils.extract import ContentExtractor
+from utils.loop import get_io_loop
+from utils.logger import logger
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+    "Referer": "https://www.google.com/",
+}
+HTML_CONTENT_TYPES = {"text/html", "application/xhtml+xml"}
+META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+
+def _charset(response: httpx.Response, head: bytes) -> str:
+    """
+    Des:
+        응답 본문 인코딩 확인 함수
+            - Content-Type 에 charset 이 없으면 <meta charset> 을 확인 (euc-kr 페이지 대응)
+    """
+    for charset in (response.charset_encoding, _meta_charset(head)):
+        if charset:
+            try:
+                return codecs.lookup(charset).name
+            except LookupError:
+                pass
+    return "utf-8"
+
+
+def _meta_charset(head: bytes) -> str | None:
+    match = META_CHARSET.search(head)
+    return match.group(1).decode() if match else None
+
+
+class ContentFetcher:
+    """
+    Des:
+        검색 결과 페이지를 한번에 수집하는 클래스
+            - 공용 I/O 루프에서 keep-alive HTTP 클라이언트 하나를 계속 재사용
+            - 호스트별 동시 요청 수 제한 (요청 중인 호스트만 유지)
+            - HTML 이 아닌 응답(PDF 등)은 내려받지 않음
+            - 본문은 받는 대로 파서에 넣고, max_bytes 를 넘으면 다운로드 중단
+            - 추출된 내용은 URL 기준으로 캐시(TTL)
+    """
+
+    def __init__(
+        self,
+        max_connections: int,
+        per_host_limit: int,
+        timeout: float,
+        max_bytes: int,
+        max_text_chars: int,
+    ):
+        self.max_connections = max_connections
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.max_text_chars = max_text_chars
+        self._io_loop = get_io_loop()
+        self._client = None
+        self._hosts = {}  # host -> [Semaphore, 요청/대기 수]
+        self._cache = get_cache("content")
+
+    def fetch_all(self, links: list[str]) -> list[tuple[str, str]]:
+        """
+        Des:
+            여러 링크의 내용을 동시에 추출하는 함수 (동기)
+        Args:
+            links (list[str]): 추출할 링크 리스트
+        Returns:
+            list[tuple[str, str]]: 링크 순서대로 (설명, 내용) 튜플, 실패한 링크는 ("", "")
+        """
+        return self._io_loop.run(self._fetch_all(links))
+
+    async def afetch_all(self, links: list[str]) -> list[tuple[str, str]]:
+        """
+        Des:
+            여러 링크의 내용을 동시에 추출하는 함수 (비동기)
+        """
+        return await asyncio.wrap_future(self._io_loop.submit(self._fetch_all(links)))
+
+    def fetch(self, link: str) -> tuple[str, str]:
+        """
+        Des:
+            링크 하나의 내용을 추출하는 함수 (동기, 실패시 예외 발생)
+        """
+        return self._io_loop.run(self._fetch(link))
+
+    def close(self):
+        if self._client is not None:
+            self._io_loop.run(self._client.aclose(), timeout=10)
+            self._client = None
+
+    async def _fetch_all(self, links: list[str]) -> list[tuple[str, str]]:
+        results = await asyncio.gather(
+            *[self._fetch(link) for link in links], return_exceptions=True
+        )
+        contents = []
+        for link, result in zip(links, results):
+            if isinstance(result, BaseException):
+                logger.warning("페이지 수집 실패 ({}): {!r}", link, result)
+                contents.append(("", ""))
+            else:
+                contents.append(result)
+        return contents
+
+    async def _fetch(self, link: str) -> tuple[str, str]:
+        cached = await self._cache.aget(link)
+        if cached is not None:
+            return tuple(cached)
+        async with self._host_slot(link):
+            content = await self._download(link)
+        if content[1]:
+            self._cache.set(link, content)
+        return content
+
+    async def _download(self, link: str) -> tuple[str, str]:
+        extractor = ContentExtractor(max_chars=self.max_bytes, max_text_chars=self.max_text_chars)
+        async with self._get_client().stream("GET", link) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+            if content_type and content_type not in HTML_CONTENT_TYPES:
+                logger.debug("HTML 이 아닌 페이지 제외 ({}): {}", link, content_type)
+                return "", ""
+            decoder = None
+            head = b""
+            received = 0
+            async for chunk in response.aiter_bytes():
+                received += len(chunk)
+                if decoder is None:
+                    # <meta charset> 확인용으로 앞부분을 모은 뒤 디코딩 시작
+                    head += chunk
+                    if len(head) < 4096 and received < self.max_bytes:
+                        continue
+                    decoder = codecs.getincrementaldecoder(_charset(response, head))(errors="replace")
+                    chunk, head = head, b""
+                extractor.feed(decoder.decode(chunk))
+                if extractor.done or received >= self.max_bytes:
+                    break
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(_charset(response, head))(errors="replace")
+                extractor.feed(decoder.decode(head))
+            extractor.feed(decoder.decode(b"", final=True))
+        return extractor.result()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                headers=HEADERS,
+                timeout=self.timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    @asynccontextmanager
+    async def _host_slot(self, link: str):
+        # 공용 I/O 루프에서만 호출되므로 별도 락 없이 카운트 관리
+        host = urlsplit(link).netloc
+        entry = self._hosts.get(host)
+        if entry is None:
+            entry = self._hosts[host] = [asyncio.Semaphore(self.per_host_limit), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._hosts[host]
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_fetcher() -> ContentFetcher:
+    """
+    Des:
+        프로세스 공용 페이지 수집기를 반환하는 함수
+    """
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = ContentFetcher(
+                max_connections=system_config.fetcher.max_connections,
+                per_host_limit=system_config.fetcher.per_host_limit,
+                timeout=system_config.fetcher.timeout,
+                max_bytes=system_config.fetcher.max_bytes,
+                max_text_chars=system_config.fetcher.max_text_chars,
+            )
+            atexit.register(_fetcher.close)
+    return _fetcher
+
+
+def fetch_contents(links: list[str]) -> list[tuple[str, str]]:
+    """
+    Des:
+        검색 결과 링크들의 내용을 한번에 추출하는 함수
+    Args:
+        links (list[str]): 추출할 링크 리스트
+    Returns:
+        list[tuple[str, str]]: 링크 순서대로 (설명, 내용) 튜플
+    """
+    return get_fetcher().fetch_all(links)
+
+
+async def afetch_contents(links: list[str]) -> list[tuple[str, str]]:
+    """
+    Des:
+        검색 결과 링크들의 내용을 한번에 추출하는 함수 (비동기)
+    Args:
+        links (list[str]): 추출할 링크 리스트
+    Returns:
+        list[tuple[str, str]]: 링크 순서대로 (설명, 내용) 튜플
+    """
+    return await get_fetcher().afetch_all(links)
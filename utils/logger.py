@@ -0,0 +1,79 @@
+import os
+import sys
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from loguru import logger
+from configs.config import system_config
+
+# 현재 요청의 사용자/요청 ID (모든 로그에 extra 로 붙음)
+log_ids = ContextVar("log_ids", default={"user_id": "-", "request_id": "-"})
+
+CONSOLE_FORMAT = (
+    "<green>{time:HH:mm:ss.SSS}</green> | <level>{level: <7}</level> | "
+    "<cyan>{name}</cyan> | {extra[user_id]} {extra[request_id]} | <level>{message}</level>"
+)
+
+
+def _patch(record):
+    record["extra"].update(log_ids.get())
+
+
+def setup_logging():
+    """
+    Des:
+        loguru 로그 설정 함수 (서버 시작시 lifespan 에서 실행, import 만 하는 도구/벤치마크는 로그 파일을 만들지 않음)
+            - enqueue=True : 요청 처리 중에는 대기열에 넣기만 하고, 파일/터미널 쓰기는 별도 스레드에서 처리
+            - 파일은 JSON lines (serialize=True), 터미널은 console_level 이상만 출력
+            - 모든 로그에 사용자/요청 ID 추가 (log_context)
+    """
+    config = system_config.logging
+    logger.remove()
+    logger.configure(patcher=_patch)
+    if config.path:
+        path = config.path
+        if system_config.deployment.mode == "multi":
+            # 파일 교체(rotation)는 프로세스 간에 안전하지 않으므로 워커별로 파일 분리
+            root, ext = os.path.splitext(path)
+            path = f"{root}.{os.getpid()}{ext}"
+        logger.add(
+            path,
+            level=config.level,
+            serialize=True,
+            enqueue=True,
+            rotation=config.rotation,
+            retention=config.retention,
+            encoding="utf-8",
+        )
+    if config.console_level != "OFF":
+        logger.add(sys.stderr, level=config.console_level, format=CONSOLE_FORMAT, enqueue=True)
+
+
+@contextmanager
+def log_context(**ids):
+    """
+    Des:
+        with 블록 안의 로그(이 블록에서 만든 asyncio 작업 포함)에 사용자/요청 ID 를 붙이는 함수
+    Args:
+        ids: user_id, request_id
+    """
+    token = log_ids.set({**log_ids.get(), **ids})
+    try:
+        yield
+    finally:
+        log_ids.reset(token)
+
+
+def clip(text, limit: int = None) -> str:
+    """
+    Des:
+        긴 프롬프트/본문을 잘라서 반환하는 함수
+            - sample_rate 비율만큼은 자르지 않고 전체를 반환 (디버깅용 표본)
+            - DEBUG 로그에서는 logger.opt(lazy=True) 와 함께 사용 (레벨이 꺼져 있으면 문자열을 만들지 않음)
+                logger.opt(lazy=True).debug("프롬프트 : {}", lambda: clip(prompt))
+    """
+    text = str(text)
+    limit = limit or system_config.logging.max_chars
+    if len(text) <= limit or random.random() < system_config.logging.sample_rate:
+        return text
+    return f"{text[:limit]}...(+{len(text) - limit}자)"
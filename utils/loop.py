@@ -0,0 +1,75 @@
+import atexit
+import asyncio
+import threading
+import concurrent.futures
+
+
+class BackgroundLoop:
+    """
+    Des:
+        전용 스레드에서 돌아가는 이벤트 루프
+            - 랭그래프 노드(동기)에서 비동기 I/O (브라우저, HTTP 클라이언트)를 사용하기 위함
+            - 루프에 묶인 자원(Playwright, httpx 커넥션 풀)을 프로세스 내에서 계속 재사용
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self.loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self.loop.run_forever, name=self.name, daemon=True
+            )
+            self._thread.start()
+
+    def submit(self, coro):
+        """
+        Des:
+            코루틴을 루프에 등록하고 concurrent.futures.Future 를 반환하는 함수
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: float = None):
+        """
+        Des:
+            코루틴을 루프에서 실행하고 결과를 기다리는 함수 (동기)
+                - 시간 초과 시 루프의 코루틴도 취소해 대여 중인 자원(페이지, 커넥션)을 돌려받음
+        """
+        future = self.submit(coro)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self):
+        with self._lock:
+            if self._thread is None:
+                return
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=10)
+            self._thread = None
+
+
+_io_loop = None
+_io_loop_lock = threading.Lock()
+
+
+def get_io_loop() -> BackgroundLoop:
+    """
+    Des:
+        프로세스 공용 I/O 루프를 반환하는 함수
+    """
+    global _io_loop
+    with _io_loop_lock:
+        if _io_loop is None:
+            _io_loop = BackgroundLoop("io-loop")
+            atexit.register(_io_loop.stop)
+    return _io_loop
@@ -0,0 +1,187 @@
+import time
+import bisect
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+
+# 현재 실행중인 그래프 노드 이름 (LLM 호출을 노드별로 집계하기 위함)
+current_node = ContextVar("current_node", default="-")
+# 현재 요청(턴)의 단계별 소요시간/토큰 기록
+current_trace = ContextVar("current_trace", default=None)
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+class Counter:
+    """누적 카운터 (라벨별)"""
+
+    def __init__(self, name: str, description: str, label_names: tuple = ()):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                labels = dict(zip(self.label_names, key))
+                lines.append(f"{self.name}{_format_labels(labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """분포 (라벨별 버킷 누적 카운트, 합계, 개수)"""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        label_names: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        self._values = {}  # key -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.label_names)
+        with self._lock:
+            entry = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                labels = dict(zip(self.label_names, key))
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    bucket_labels = _format_labels({**labels, "le": bound})
+                    lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f'{self.name}_bucket{_format_labels({**labels, "le": "+Inf"})} {count}')
+                lines.append(f"{self.name}_sum{_format_labels(labels)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+NODE_SECONDS = Histogram(
+    "kakao_node_seconds", "그래프 노드별 소요시간 (초)", ("node",)
+)
+SEARCH_STEP_SECONDS = Histogram(
+    "kakao_search_step_seconds", "검색 단계별 소요시간 (초)", ("step",)
+)
+LLM_SECONDS = Histogram(
+    "kakao_llm_seconds", "LLM 호출 소요시간 (초, 대기시간 제외)", ("node",)
+)
+LLM_QUEUE_SECONDS = Histogram(
+    "kakao_llm_queue_seconds", "LLM 호출 창구 대기시간 (초)", ("node",)
+)
+LLM_TOKENS = Counter(
+    "kakao_llm_tokens_total", "LLM 토큰 사용량 (prompt, completion, cached)", ("node", "type")
+)
+LLM_COST = Counter("kakao_llm_cost_usd_total", "LLM 예상 비용 (USD)", ("node",))
+LLM_CALLS = Counter("kakao_llm_calls_total", "LLM 호출 수", ("node", "status"))
+TURN_SECONDS = Histogram(
+    "kakao_turn_seconds", "요청(턴) 처리 소요시간 (초, 콜백 전송 제외)", ("kind",)
+)
+METRICS = [
+    NODE_SECONDS,
+    SEARCH_STEP_SECONDS,
+    LLM_SECONDS,
+    LLM_QUEUE_SECONDS,
+    LLM_TOKENS,
+    LLM_COST,
+    LLM_CALLS,
+    TURN_SECONDS,
+]
+
+
+def render_metrics() -> str:
+    """
+    Des:
+        모든 지표를 Prometheus 텍스트 형식으로 반환하는 함수 (/metrics)
+    """
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def record(name: str, value):
+    """
+    Des:
+        현재 요청(턴) 기록에 값 누적 (start_trace 로 시작한 경우에만)
+    """
+    trace = current_trace.get()
+    if trace is not None:
+        trace[name] = trace.get(name, 0) + value
+
+
+def start_trace() -> dict:
+    """
+    Des:
+        현재 요청(턴)의 단계별 기록 시작 함수
+    Returns:
+        기록이 누적될 dict (노드/검색 단계 소요시간, 토큰, 비용)
+    """
+    trace = {}
+    current_trace.set(trace)
+    return trace
+
+
+@contextmanager
+def timer(histogram: Histogram, trace_key: str = None, **labels):
+    """
+    Des:
+        with 블록의 소요시간을 histogram 에 기록하는 함수
+    """
+    START_TIME = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - START_TIME
+        histogram.observe(elapsed, **labels)
+        if trace_key:
+            record(trace_key, elapsed)
+
+
+def track_node(name: str, node):
+    """
+    Des:
+        그래프 노드 소요시간을 기록하는 래퍼
+            - 노드 안에서 호출한 LLM 은 이 노드 이름으로 집계됨
+            - functools.wraps 로 원래 시그니처(config, store 인자)를 유지
+    """
+
+    @functools.wraps(node)
+    async def wrapper(*args, **kwargs):
+        token = current_node.set(name)
+        try:
+            with timer(NODE_SECONDS, trace_key=f"{name}_s", node=name):
+                return await node(*args, **kwargs)
+        finally:
+            current_node.reset(token)
+
+    return wrapper
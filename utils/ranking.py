@@ -0,0 +1,156 @@
+import re
+import math
+from collections import Counter
+
+WORD = re.compile(r"[0-9a-zA-Z]+|[가-힣]+")
+HANGUL = re.compile(r"[가-힣]+")
+PARAGRAPH = re.compile(r"\n\s*\n")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Des:
+        BM25 용 토큰화 함수
+            - 영문/숫자는 소문자 단어 단위
+            - 한글은 조사/어미가 붙어도 매칭되도록 글자 2-gram 단위 (한 글자 단어는 그대로)
+    """
+    tokens = []
+    for word in WORD.findall(text.lower()):
+        if HANGUL.fullmatch(word) and len(word) > 1:
+            tokens.extend(word[i : i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def split_passages(text: str, passage_chars: int, min_chars: int) -> list[str]:
+    """
+    Des:
+        페이지 본문을 문단 단위로 나누고, passage_chars 길이 정도로 묶는 함수
+            - 너무 긴 문단은 passage_chars 단위로 자름
+            - min_chars 보다 짧은 조각(메뉴, 버튼 문구 등)은 버림
+    """
+    passages = []
+    current = ""
+    for paragraph in PARAGRAPH.split(text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        while len(paragraph) > passage_chars:
+            if current:
+                passages.append(current)
+                current = ""
+            passages.append(paragraph[:passage_chars])
+            paragraph = paragraph[passage_chars:]
+        if current and len(current) + len(paragraph) + 1 > passage_chars:
+            passages.append(current)
+            current = ""
+        current = f"{current}\n{paragraph}" if current else paragraph
+    if current:
+        passages.append(current)
+    return [passage for passage in passages if len(passage) >= min_chars]
+
+
+class BM25:
+    """
+    Des:
+        Okapi BM25 점수 계산 클래스 (외부 서비스 없이 로컬에서 문서 순위 계산)
+    """
+
+    def __init__(self, documents: list[list[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(document) for document in documents]
+        self.lengths = [len(document) for document in documents]
+        self.avg_length = sum(self.lengths) / len(documents) if documents else 0
+        doc_freqs = Counter(term for tf in self.term_freqs for term in tf)
+        count = len(documents)
+        self.idf = {
+            term: math.log(1 + (count - freq + 0.5) / (freq + 0.5))
+            for term, freq in doc_freqs.items()
+        }
+
+    def scores(self, query: list[str]) -> list[float]:
+        """
+        Des:
+            질의 토큰에 대한 문서별 BM25 점수 반환 함수
+        """
+        query_terms = set(query)
+        results = []
+        for tf, length in zip(self.term_freqs, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / (self.avg_length or 1))
+            score = 0.0
+            for term in query_terms:
+                freq = tf.get(term)
+                if freq:
+                    score += self.idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            results.append(score)
+        return results
+
+
+def build_search_context(
+    query: str,
+    pages: list[dict],
+    budget_tokens: int,
+    chars_per_token: float,
+    passage_chars: int,
+    min_passage_chars: int,
+) -> tuple[str, list[int]]:
+    """
+    Des:
+        검색 결과 페이지들에서 질의와 관련된 문단만 골라 토큰 예산 안에서 참고내용을 만드는 함수
+            - 페이지 본문을 문단으로 나누고 BM25 로 질의와의 관련도 계산
+            - 점수가 높은 문단부터 예산(budget_tokens)이 찰 때까지 선택 (0점 문단 제외)
+            - 선택된 문단은 페이지별로, 원래 순서대로 묶어서 출력
+    Args:
+        query: 질의 (사용자 요청 + 검색어)
+        pages: 페이지 리스트 ({"title", "link", "desc", "content"})
+        budget_tokens: 참고내용 최대 토큰 수 (추정치)
+        chars_per_token: 토큰 수 추정용 글자수
+        passage_chars: 문단 최대 길이
+        min_passage_chars: 문단 최소 길이
+    Returns:
+        참고내용, 참고내용에 사용된 페이지 인덱스 리스트
+    """
+    passages = []  # (page index, passage index, text)
+    for page_idx, page in enumerate(pages):
+        for passage_idx, passage in enumerate(
+            split_passages(page["content"], passage_chars, min_passage_chars)
+        ):
+            passages.append((page_idx, passage_idx, passage))
+    if not passages:
+        return "", []
+
+    # 페이지 제목/설명도 함께 점수에 반영
+    bm25 = BM25(
+        [
+            tokenize(f'{pages[page_idx]["title"]} {pages[page_idx]["desc"]} {text}')
+            for page_idx, _, text in passages
+        ]
+    )
+    scores = bm25.scores(tokenize(query))
+    ranked = sorted(range(len(passages)), key=lambda i: scores[i], reverse=True)
+    if scores[ranked[0]] > 0:
+        # 질의와 겹치는 단어가 하나도 없는 문단은 제외 (모두 0점이면 원래 순서대로 사용)
+        ranked = [i for i in ranked if scores[i] > 0]
+
+    budget_chars = budget_tokens * chars_per_token
+    selected = {}  # page index -> [(passage index, text)]
+    used_chars = 0
+    for i in ranked:
+        page_idx, passage_idx, text = passages[i]
+        header_chars = 0
+        if page_idx not in selected:
+            page = pages[page_idx]
+            header_chars = len(page["title"]) + len(page["link"]) + len(page["desc"]) + 30
+        if used_chars + header_chars + len(text) > budget_chars:
+            continue
+        selected.setdefault(page_idx, []).append((passage_idx, text))
+        used_chars += header_chars + len(text)
+
+    context = ""
+    for page_idx in sorted(selected):
+        page = pages[page_idx]
+        content = "\n...\n".join(text for _, text in sorted(selected[page_idx]))
+        context += f'제목 : {page["title"]}\n링크 : {page["link"]}\n설명 : {page["desc"]}\n내용 : {content}\n\n'
+    return context, sorted(selected)
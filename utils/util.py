@@ -1,14 +1,12 @@
 import os
 import re
+import asyncio
 import random
-import requests
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-from playwright.sync_api import sync_playwright
-from playwright.async_api import async_playwright
-from langchain_community.document_loaders import AsyncHtmlLoader
-from langchain_community.document_transformers import Html2TextTransformer
+from configs.config import system_config
+from utils.cache import get_cache
+from utils.logger import logger
 
 RESET = "\033[0m"  # Reset to default
 RED = "\033[91m"  # Bright Red
@@ -18,8 +16,11 @@ YELLOW = "\033[93m"  # Bright Yellow
 PINK = "\033[95m"  # Bright Pink
 
 def set_env():
+    """
+    Des:
+        .env 의 환경변수(OPENAI_API_KEY 등) 로드 함수 (LLM 클라이언트 생성 직전에 호출)
+    """
     load_dotenv()
-    os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
 
 
 def extract_content(link: str) -> tuple[str, str]:
@@ -31,13 +32,9 @@ def extract_content(link: str) -> tuple[str, str]:
     Returns:
         tuple[str, str]: 추출된 내용을 담은 튜플
     """
-    loader = AsyncHtmlLoader(link)
-    docs = loader.load()
-    html2text = Html2TextTransformer()
-    docs_transformed = html2text.transform_documents(docs, metadata_type="html")
-    desc = docs_transformed[0].metadata.get("description", "")
-    detailed_content = docs_transformed[0].page_content
-    return desc, detailed_content
+    from utils.fetcher import get_fetcher
+
+    return get_fetcher().fetch(link)
 
 
 def parse_relative_date(relative_date: str) -> str:
@@ -79,6 +76,8 @@ def _run_playwright_in_process(search_term: str, SEARCH_RESULT_COUNT: int, queue
         SEARCH_RESULT_COUNT (int): 검색 결과 수
         queue (Queue): 결과를 전달할 큐
     """
+    from playwright.sync_api import sync_playwright
+
     try:
         with sync_playwright() as p:
             # 기존 google_search_scrape 로직
@@ -125,24 +124,118 @@ def _run_playwright_in_process(search_term: str, SEARCH_RESULT_COUNT: int, queue
                     results.append({"title": title, "link": link})
                 queue.put(results)
             except Exception as e:
-                print(f"에러 발생: {str(e)}")
+                logger.error("검색 중 에러 발생: {}", e)
                 page.screenshot(path=f'{datetime.now().strftime("%Y%m%d_%H%M%S")}_error.png')
                 queue.put(None)
             finally:
                 browser.close()
     except Exception as e:
-        print(f"Playwright 초기화 에러: {str(e)}")
+        logger.error("Playwright 초기화 에러: {}", e)
         queue.put(None)
 
 def google_search_scrape(search_term: str, SEARCH_RESULT_COUNT: int):
-    """멀티프로세싱을 사용하는 메인 함수"""
+    """
+    Des:
+        구글 검색 메인 함수
+            - 브라우저 풀 사용시 미리 띄워둔 페이지를 대여해서 검색
+            - 브라우저 풀 미사용시 검색마다 별도 프로세스에서 브라우저 실행
+            - 같은 검색어는 캐시(TTL)에서 바로 반환
+    Args:
+        search_term (str): 검색할 키워드
+        SEARCH_RESULT_COUNT (int): 검색 결과 수
+    Returns:
+        list: 검색 결과를 담은 리스트
+    """
+    search_cache = get_cache("search")
+    cache_key = _search_cache_key(search_term, SEARCH_RESULT_COUNT)
+    results = search_cache.get(cache_key)
+    if results is not None:
+        return results
+
+    if system_config.browser_pool.enabled:
+        from utils.browser import get_browser_pool
+
+        try:
+            results = get_browser_pool().search(
+                search_term,
+                SEARCH_RESULT_COUNT,
+                timeout=system_config.browser_pool.search_timeout,
+            )
+        except Exception as e:
+            logger.error("검색 중 에러 발생: {}", e)
+            raise Exception("검색 실패")
+    else:
+        results = _search_in_process(search_term, SEARCH_RESULT_COUNT)
+
+    if results:
+        search_cache.set(cache_key, results)
+    return results
+
+
+async def agoogle_search_scrape(search_term: str, SEARCH_RESULT_COUNT: int):
+    """
+    Des:
+        구글 검색 메인 함수 (비동기)
+            - google_search_scrape 와 동일하지만 호출한 이벤트 루프를 막지 않음
+    Args:
+        search_term (str): 검색할 키워드
+        SEARCH_RESULT_COUNT (int): 검색 결과 수
+    Returns:
+        list: 검색 결과를 담은 리스트
+    """
+    search_cache = get_cache("search")
+    cache_key = _search_cache_key(search_term, SEARCH_RESULT_COUNT)
+    results = await search_cache.aget(cache_key)
+    if results is not None:
+        return results
+
+    if system_config.browser_pool.enabled:
+        from utils.browser import get_browser_pool
+
+        try:
+            results = await get_browser_pool().asearch(
+                search_term,
+                SEARCH_RESULT_COUNT,
+                timeout=system_config.browser_pool.search_timeout,
+            )
+        except Exception as e:
+            logger.error("검색 중 에러 발생: {}", e)
+            raise Exception("검색 실패")
+    else:
+        results = await asyncio.to_thread(
+            _search_in_process, search_term, SEARCH_RESULT_COUNT
+        )
+
+    if results:
+        search_cache.set(cache_key, results)
+    return results
+
+
+_per_call_warned = False
+
+
+def _search_cache_key(search_term: str, SEARCH_RESULT_COUNT: int) -> str:
+    return f"{SEARCH_RESULT_COUNT}:{' '.join(search_term.lower().split())}"
+
+
+def _search_in_process(search_term: str, SEARCH_RESULT_COUNT: int):
+    """
+    Des:
+        별도 프로세스에서 브라우저를 실행해 검색하는 함수 (브라우저 풀 미사용시)
+            - 호출할 때마다 프로세스 생성 + Chromium 실행 (풀 도입 전 방식)
+            - browser_pool.enabled=False 로 풀을 끈 경우에만 사용 (디버깅/비교용)
+    """
+    global _per_call_warned
+    if not _per_call_warned:
+        _per_call_warned = True
+        logger.warning("browser_pool.enabled=False : 검색마다 브라우저를 새로 실행합니다.")
     queue = Queue()
     process = Process(target=_run_playwright_in_process, 
                     args=(search_term, SEARCH_RESULT_COUNT, queue))
     process.start()
     results = queue.get()  # 결과를 기다림
     process.join()
-    
+
     if results is None:
         raise Exception("검색 실패")
     return results